@@ -0,0 +1,74 @@
+"""Check that the tokenizer parsing todo texts gives the exact same results as the regular expressions it replaces.
+
+Texts are taken from generated todo lines, and from random lines of tricky tokens (slashes and colons in tags, double
+spaces, projects, contexts and tags as the first word...), once their completion, priority and dates data is parsed
+like :func:`todotxtio._parse_fields` does. Exits with an error on the first mismatch.
+
+Usage: python benchmarks/differential.py [number of texts] [seed]
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from generate import generate_lines
+import todotxtio
+
+PREFIXES = ['', 'x ', 'x  ', '(A) ', 'x 2021-01-01 ', '(B) 2020-01-01  ', '2020-01-01 ']
+TOKENS = [
+    'call', 'mom', 'é', '+project', '+', '+a+b', '+p/q', '@context', '@', '@a:b', 'due:2021-01-01', 'key:value',
+    'a:b:c', 'a:b/c', 'a/b:c', 'http://example.com', 'k:', ':v', ':', '::', 'a::b', '+p:v', '@c/d', 'x', '(A)',
+    '2020-01-01', ''
+]
+
+
+def random_lines(count, seed):
+    """Return random todo lines made of tricky tokens, possibly separated by several spaces."""
+    rng = random.Random(seed)
+    lines = []
+
+    for _ in range(count):
+        tokens = [rng.choice(TOKENS) for _ in range(rng.randint(1, 8))]
+
+        lines.append(rng.choice(PREFIXES) + ' '.join(tokens))
+
+    return lines
+
+
+def normalize(fields):
+    """Return parsed text fields with empty projects, contexts and tags as empty containers, whatever their type."""
+    text, projects, contexts, tags = fields
+
+    return text, projects or [], contexts or [], tags or {}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 42
+
+    lines = generate_lines(count // 2, seed, tags=0.5, tag_names=('due', 'url', 'a:b'))
+    lines.extend(random_lines(count - len(lines), seed))
+
+    # Texts are what remains of the lines once their completion, priority and dates data is parsed
+    texts = [todotxtio._parse_prefix(line.strip())[4] for line in lines]
+
+    checked = 0
+
+    for text in texts:
+        if not text.isprintable(): # Those always go through the regular expressions
+            continue
+
+        expected = normalize(todotxtio._regex_parse_text(text))
+        actual = normalize(todotxtio._tokenize_text(text))
+
+        if actual != expected:
+            sys.exit('Mismatch for {!r}:\n  regex:     {!r}\n  tokenizer: {!r}'.format(text, expected, actual))
+
+        checked += 1
+
+    print('{} texts checked, no mismatch'.format(checked))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Generate a deterministic synthetic todo.txt file.
+
+Usage: python benchmarks/generate.py [number of todos] [output file] [seed]
+"""
+import random
+import sys
+
+WORDS = ['call', 'mom', 'buy', 'milk', 'write', 'report', 'fix', 'bug', 'review', 'plan', 'trip']
+
+
+def generate_lines(count, seed=42, completed=0.3, priority=0.4, dated=0.7, projects=0.5, contexts=0.5, tags=0.2,
+                   distinct_projects=31, distinct_contexts=16, tag_names=('due',)):
+    """Return a list of random, but always the same for a given seed, todo lines.
+
+    Ratios are the probabilities for a todo to be completed, to have a priority, a creation date, a project, a
+    context and a tag. Projects, contexts and tag names are picked among the given number of distinct ones.
+    """
+    rng = random.Random(seed)
+    lines = []
+
+    for _ in range(count):
+        parts = []
+
+        if rng.random() < completed:
+            parts.append('x 2021-{:02d}-{:02d}'.format(rng.randint(1, 12), rng.randint(1, 28)))
+
+        if rng.random() < priority:
+            parts.append('(' + rng.choice('ABCDE') + ')')
+
+        if rng.random() < dated:
+            parts.append('2020-{:02d}-{:02d}'.format(rng.randint(1, 12), rng.randint(1, 28)))
+
+        parts.extend(rng.choice(WORDS) for _ in range(rng.randint(2, 8)))
+
+        if rng.random() < projects:
+            parts.append('+project' + str(rng.randint(0, distinct_projects - 1)))
+
+        if rng.random() < contexts:
+            parts.append('@context' + str(rng.randint(0, distinct_contexts - 1)))
+
+        if rng.random() < tags:
+            tag_name = tag_names[0] if len(tag_names) == 1 else rng.choice(tag_names)
+
+            parts.append('{}:2021-{:02d}-{:02d}'.format(tag_name, rng.randint(1, 12), rng.randint(1, 28)))
+
+        lines.append(' '.join(parts))
+
+    return lines
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 42
+    string = '\n'.join(generate_lines(count, seed))
+
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], 'w', encoding='utf-8') as stream:
+            stream.write(string)
+    else:
+        print(string)
+
+
+if __name__ == '__main__':
+    main()
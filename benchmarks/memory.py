@@ -0,0 +1,125 @@
+"""Compare the memory footprint of parsed todos against the previous, ``__dict__``-based, Todo class, and with or
+without interning their projects, contexts, tag names and dates.
+
+Usage: python benchmarks/memory.py [number of todos]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from generate import generate_lines
+import todotxtio
+
+
+class LegacyTodo:
+    """The Todo class as it was before it used slots."""
+    text = None
+    completed = False
+    completion_date = None
+    priority = None
+    creation_date = None
+    projects = []
+    contexts = []
+    tags = {}
+
+    def __init__(self, text=None, completed=False, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None):
+        self.text = text
+        self.completed = completed
+
+        if completion_date and self.completed:
+            self.completion_date = completion_date
+
+        self.priority = priority
+        self.creation_date = creation_date
+        self.projects = projects
+        self.contexts = contexts
+        self.tags = tags
+
+    def __setattr__(self, name, value):
+        if name == 'completed':
+            if not value:
+                super().__setattr__('completion_date', None)
+        elif name == 'completion_date':
+            if value:
+                super().__setattr__('completed', True)
+            else:
+                super().__setattr__('completed', False)
+        elif name in ['projects', 'contexts']:
+            if not value:
+                super().__setattr__(name, [])
+                return
+            elif type(value) is not list:
+                raise ValueError(name + ' should be a list')
+        elif name == 'tags':
+            if not value:
+                super().__setattr__(name, {})
+                return
+            elif type(value) is not dict:
+                raise ValueError(name + ' should be a dict')
+
+        super().__setattr__(name, value)
+
+
+def measure(todo_class, fields):
+    """Return the traced memory per todo (in bytes) and the construction time (in seconds) of a list of todos."""
+    start = time.perf_counter()
+    todos = [todo_class(*todo_fields) for todo_fields in fields]
+    elapsed = time.perf_counter() - start
+
+    del todos
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    todos = [todo_class(*todo_fields) for todo_fields in fields]
+
+    size = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return size / len(todos), elapsed
+
+
+def measure_parsing(lines, intern):
+    """Return the traced memory per todo (in bytes) and the parsing time (in seconds) of a list of todo lines."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+
+    todos = [todotxtio.Todo(*todotxtio._parse_fields(line, intern)) for line in lines]
+
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return size / len(todos), elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    # Parsed fields are built upfront so only the todo objects themselves are measured
+    fields = [todotxtio._parse_fields(line) for line in generate_lines(count)]
+
+    print('{:<12} {:>14} {:>12}'.format('class', 'bytes/todo', 'build (s)'))
+
+    for name, todo_class in (('LegacyTodo', LegacyTodo), ('Todo', todotxtio.Todo)):
+        per_todo, elapsed = measure(todo_class, fields)
+
+        print('{:<12} {:>14.1f} {:>12.3f}'.format(name, per_todo, elapsed))
+
+    lines = generate_lines(count)
+
+    print()
+    print('{:<12} {:>14} {:>12}'.format('interning', 'bytes/todo', 'parse (s)'))
+
+    for name, intern in (('none', lambda string: string), ('sys.intern', sys.intern), ('symbols', todotxtio._interner({}))):
+        per_todo, elapsed = measure_parsing(lines, intern)
+
+        print('{:<12} {:>14.1f} {:>12.3f}'.format(name, per_todo, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Measure how parsing a big todo file scales with the number of worker processes.
+
+Usage: python benchmarks/parallel.py [number of todos] [max number of workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from generate import generate_lines
+import todotxtio
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    fd, file_path = tempfile.mkstemp(suffix='.txt')
+
+    with os.fdopen(fd, 'w', encoding='utf-8') as stream:
+        stream.write('\n'.join(generate_lines(count)))
+
+    try:
+        print('{} todos, {:.1f} MiB, {} CPUs'.format(count, os.path.getsize(file_path) / 1024 / 1024, os.cpu_count()))
+        print('{:>8} {:>10} {:>9}'.format('workers', 'time (s)', 'speedup'))
+
+        workers = 1
+        serial = None
+
+        while workers <= max_workers:
+            start = time.perf_counter()
+            todotxtio.from_file(file_path, workers=workers)
+            elapsed = time.perf_counter() - start
+
+            if serial is None:
+                serial = elapsed
+
+            print('{:>8} {:>10.3f} {:>8.2f}x'.format(workers, elapsed, serial / elapsed))
+
+            workers *= 2
+    finally:
+        os.remove(file_path)
+
+
+if __name__ == '__main__':
+    main()
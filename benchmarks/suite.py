@@ -0,0 +1,175 @@
+"""Time the main todotxtio functions on a synthetic todo list, and track their peak memory usage.
+
+Results are written as JSON so runs can be compared, for example before and after a change:
+
+    python benchmarks/suite.py --output before.json
+    python benchmarks/suite.py --compare before.json
+
+Run with --help to see how to change the size and the mix of the generated todo list.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from generate import generate_lines
+import todotxtio
+
+
+def build_benchmarks(todos, string, file_path):
+    """Return the benchmarks to run, mapping their name to a function without arguments."""
+    dicts = todotxtio.to_dicts(todos)
+    sample = next((todo for todo in todos if todo.completed and todo.creation_date and todo.projects), todos[0])
+
+    benchmarks = {
+        'from_string': lambda: todotxtio.from_string(string),
+        'from_file': lambda: todotxtio.from_file(file_path),
+        'to_string': lambda: todotxtio.to_string(todos),
+        'Todo.__str__': lambda: [str(todo) for todo in todos],
+        'to_dicts': lambda: todotxtio.to_dicts(todos),
+        'from_dicts': lambda: todotxtio.from_dicts(dicts)
+    }
+
+    criteria = {
+        'text': 'bug',
+        'completed': True,
+        'completion_date': sample.completion_date,
+        'priority': ['A', 'B'],
+        'creation_date': sample.creation_date,
+        'projects': sample.projects[:1],
+        'contexts': ['context1', 'context2'],
+        'tags': {'due': '2021-01-01'},
+        'creation_date_range': ('2020-03-01', '2020-06-30'),
+        'completion_date_range': ('2021-01-01', '2021-01-31')
+    }
+
+    for name, value in criteria.items():
+        benchmarks['search[' + name + ']'] = lambda name=name, value=value: todotxtio.search(todos, **{name: value})
+
+    return benchmarks
+
+
+def measure(function, repeat):
+    """Return the best and mean run times (in seconds) and the peak traced memory (in bytes) of a function."""
+    times = []
+
+    for _ in range(repeat):
+        gc.collect()
+
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+
+    # Memory is traced in a separate run, as tracing slows everything down
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'best': min(times), 'mean': sum(times) / len(times), 'peak_bytes': peak}
+
+
+def print_results(results, previous=None):
+    if previous is None:
+        print('{:<34} {:>10} {:>10} {:>12}'.format('benchmark', 'best (s)', 'mean (s)', 'peak (KiB)'))
+
+        for name, result in results.items():
+            print('{:<34} {:>10.4f} {:>10.4f} {:>12.0f}'.format(name, result['best'], result['mean'], result['peak_bytes'] / 1024))
+    else:
+        print('{:<34} {:>10} {:>10} {:>8} {:>10}'.format('benchmark', 'before (s)', 'after (s)', 'speedup', 'peak ratio'))
+
+        for name, result in results.items():
+            old = previous.get(name)
+
+            if old is None:
+                print('{:<34} {:>10} {:>10.4f}'.format(name, '-', result['best']))
+            else:
+                print('{:<34} {:>10.4f} {:>10.4f} {:>7.2f}x {:>10.2f}'.format(
+                    name,
+                    old['best'],
+                    result['best'],
+                    old['best'] / result['best'],
+                    result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 0
+                ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark todotxtio on a synthetic todo list.')
+    parser.add_argument('--count', type=int, default=100000, help='number of todos to generate')
+    parser.add_argument('--seed', type=int, default=42, help='seed of the todo list generator')
+    parser.add_argument('--completed', type=float, default=0.3, help='ratio of completed todos')
+    parser.add_argument('--priority', type=float, default=0.4, help='ratio of todos with a priority')
+    parser.add_argument('--dated', type=float, default=0.7, help='ratio of todos with a creation date')
+    parser.add_argument('--projects', type=float, default=0.5, help='ratio of todos with a project')
+    parser.add_argument('--contexts', type=float, default=0.5, help='ratio of todos with a context')
+    parser.add_argument('--tags', type=float, default=0.2, help='ratio of todos with a tag')
+    parser.add_argument('--distinct-projects', type=int, default=31, help='number of distinct projects')
+    parser.add_argument('--distinct-contexts', type=int, default=16, help='number of distinct contexts')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs of each benchmark')
+    parser.add_argument('--only', help='only run the benchmarks whose name contains this string')
+    parser.add_argument('--output', help='file to write the JSON results to')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    args = parser.parse_args()
+
+    mix = {
+        'completed': args.completed,
+        'priority': args.priority,
+        'dated': args.dated,
+        'projects': args.projects,
+        'contexts': args.contexts,
+        'tags': args.tags,
+        'distinct_projects': args.distinct_projects,
+        'distinct_contexts': args.distinct_contexts
+    }
+
+    string = '\n'.join(generate_lines(args.count, args.seed, **mix))
+    todos = todotxtio.from_string(string)
+    fd, file_path = tempfile.mkstemp(suffix='.txt')
+
+    with os.fdopen(fd, 'w', encoding='utf-8') as stream:
+        stream.write(string)
+
+    try:
+        results = {}
+
+        for name, function in build_benchmarks(todos, string, file_path).items():
+            if args.only is None or args.only in name:
+                results[name] = measure(function, args.repeat)
+    finally:
+        os.remove(file_path)
+
+    report = {
+        'meta': {
+            'todotxtio': todotxtio.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'count': args.count,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'mix': mix
+        },
+        'results': results
+    }
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as stream:
+            print_results(results, json.load(stream)['results'])
+    else:
+        print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as stream:
+            json.dump(report, stream, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,73 @@
+from array import array
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from itertools import accumulate, compress, islice, repeat, starmap
+import asyncio
+import bisect
+import codecs
+import datetime
+import gc
+import hashlib
+import heapq
+import inspect
+import io
+import mmap
+import operator
 import os
 import re
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
 
 __version__ = '0.2.3'
 
 __all__ = [
     'from_dicts',
+    'from_tuples',
     'from_stream',
     'from_file',
     'from_string',
+    'from_snapshot',
+    'load_many',
+    'iter_stream',
+    'iter_file',
+    'iter_string',
     'to_dicts',
+    'to_tuples',
     'to_stream',
     'to_file',
     'to_string',
+    'to_snapshot',
+    'afrom_stream',
+    'afrom_file',
+    'aiter_stream',
+    'aiter_file',
+    'ato_stream',
+    'ato_file',
     'Todo',
-    'search'
+    'TodoTable',
+    'TodoIndex',
+    'TodoFile',
+    'TodoList',
+    'CachedLoader',
+    'LineMemo',
+    'Stats',
+    'collect_stats',
+    'Query',
+    'search',
+    'isearch',
+    'count',
+    'exists',
+    'compile_query',
+    'sort_todos',
+    'top_k',
+    'group_by',
+    'aggregate'
 ]
 
 todo_data_regex = re.compile('^(?:(x) )?(?:(\d{4}-\d{2}-\d{2}) )?(?:\(([A-Z])\) )?(?:(\d{4}-\d{2}-\d{2}) )?')
@@ -21,306 +75,3487 @@ todo_project_regex = re.compile(' \+(\S+)')
 todo_context_regex = re.compile(' @(\S+)')
 todo_tag_regex = re.compile(' (\S+):([^\s\/]+)')
 
+todo_fields = ('text', 'completed', 'completion_date', 'priority', 'creation_date', 'projects', 'contexts', 'tags')
+
 
 def from_dicts(todos):
     """Convert a list of todo dicts to a list of :class:`todotxtio.Todo` objects.
 
+    Dicts having all the :data:`todotxtio.todo_fields` keys, and only them, are converted in bulk by giving their values
+    to the :class:`todotxtio.Todo` constructor by position.
+
     :param list todos: A list of todo dicts
     :rtype: list
     """
+    if not isinstance(todos, list):
+        todos = list(todos)
+
+    if set(map(len, todos)) <= {len(todo_fields)}:
+        try:
+            return list(starmap(Todo, map(_dict_fields, todos)))
+        except KeyError: # Unknown field, let the constructor raise a meaningful error
+            pass
+
     return [Todo(**todo) for todo in todos]
 
 
-def from_stream(stream, close=True):
+def from_tuples(todos):
+    """Convert a list of todo tuples, as returned by :func:`todotxtio.to_tuples`, to a list of :class:`todotxtio.Todo`
+    objects.
+
+    :param list todos: A list of todo tuples (or lists) of values in the :data:`todotxtio.todo_fields` order
+    :rtype: list
+    """
+    return list(starmap(Todo, todos))
+
+
+def from_stream(stream, close=True, memo=None, symbols=None):
     """Load a todo list from an already-opened stream.
 
     :param file stream: A file-like object
     :param bool close: Whetever to close the stream or not after all operation are finised
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`)
     :rtype: list
     """
-    string = stream.read()
-
-    if close:
-        stream.close()
+    with _gc_paused():
+        return list(iter_stream(stream, close=close, memo=memo, symbols=symbols))
 
-    return from_string(string)
 
-
-def from_file(file_path, encoding='utf-8'):
+def from_file(file_path, encoding='utf-8', workers=None, memory_map=False, memo=None, symbols=None):
     """Load a todo list from a file.
 
+    Big files can be parsed in parallel by a pool of ``workers`` processes, each of them parsing a part of the file.
+    This is only done for encodings in which a line break is encoded as a single ``\\n`` byte (like UTF-8).
+
     :param str file_path: Path to the file
     :param str encoding: The encoding of the file to open
+    :param int workers: Number of processes to parse the file with
+    :param bool memory_map: Whether to map the file in memory instead of reading it (see :func:`todotxtio.iter_file`)
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse (not used by ``workers``)
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`, not used by ``workers``)
+    :rtype: list
+    """
+    if workers and workers > 1 and '\n'.encode(encoding) == b'\n':
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError('File doesn\'t exists: ' + file_path)
+
+        ranges = _split_file(file_path, workers * 4) # More parts than workers so they're evenly busy
+
+        if len(ranges) > 1:
+            return _parallel_from_file(file_path, encoding, workers, ranges)
+
+    with _gc_paused():
+        return list(iter_file(file_path, encoding=encoding, memory_map=memory_map, memo=memo, symbols=symbols))
+
+
+def from_string(string, memo=None, symbols=None):
+    """Load a todo list from a string.
+
+    Projects, contexts, tag names and dates are interned, so equal ones share a single string object across todos
+    instead of being copied for each of them. They're interned with :func:`sys.intern`, or in the given ``symbols``
+    dict (mapping each string to itself), which can be shared by several todo lists.
+
+    :param str string: The string to parse
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in
+    :rtype: list
+    """
+    with _gc_paused():
+        return list(iter_string(string, memo=memo, symbols=symbols))
+
+
+def from_snapshot(snapshot_path, file_path=None, encoding='utf-8', check_hash=False, update=True):
+    """Load a todo list from a binary snapshot (see :func:`todotxtio.to_snapshot`).
+
+    If ``file_path`` is given, the snapshot is only used if the size and modification time of this todo file (and, if
+    ``check_hash`` is ``True``, the hash of its content) are the ones recorded in the snapshot. Otherwise, or if the
+    snapshot is missing or unreadable, the todo file is parsed instead, and the snapshot is written again if ``update``
+    is ``True`` (failing to write it, in a missing or read-only directory for example, isn't an error).
+
+    :param str snapshot_path: Path to the snapshot
+    :param str file_path: Path to the todo file the snapshot was made from
+    :param str encoding: The encoding of the todo file
+    :param bool check_hash: Whether to also check the hash of the todo file content
+    :param bool update: Whether to write the snapshot again when it's stale
+    :rtype: list
+    """
+    table = _load_snapshot(snapshot_path, file_path, encoding, check_hash, update)
+
+    with _gc_paused():
+        return table.to_todos()
+
+
+def load_many(file_paths, encoding='utf-8', workers=None, executor='thread', window=None):
+    """Load several todo files at once, using a pool of ``workers`` threads or processes.
+
+    Threads are best to overlap the I/O of many small files, processes to parse big files on several CPUs. At most
+    ``window`` files are loaded (and their todos held by the pool) at the same time.
+
+    Files that can't be loaded (because they don't exist or can't be decoded, for example) are mapped to the raised
+    exception instead of a list of todos.
+
+    :param list file_paths: Paths to the files
+    :param str encoding: The encoding of the files to open
+    :param int workers: Number of threads or processes to load the files with (the number of CPUs if ``None``)
+    :param str executor: Kind of pool to use, either ``thread`` or ``process``
+    :param int window: Maximum number of files loaded at the same time (twice the number of workers if ``None``)
+    :rtype: dict
+    """
+    if executor == 'thread':
+        executor_class = ThreadPoolExecutor
+        load_file = _load_file
+    elif executor == 'process':
+        executor_class = ProcessPoolExecutor
+        load_file = _load_file_fields
+    else:
+        raise ValueError('executor should be thread or process')
+
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 2
+    results = dict.fromkeys(file_paths)
+    file_paths = iter(results)
+    pending = {}
+
+    with _gc_paused(), executor_class(max_workers=workers) as pool:
+        while True:
+            for file_path in islice(file_paths, window - len(pending)):
+                pending[pool.submit(load_file, file_path, encoding)] = file_path
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                file_path = pending.pop(future)
+
+                try:
+                    todos = future.result()
+                except (OSError, ValueError) as e:
+                    results[file_path] = e
+                else:
+                    results[file_path] = todos if executor == 'thread' else [Todo(*fields) for fields in todos]
+
+    return results
+
+
+def _load_file(file_path, encoding):
+    """Load a todo list from a file (see :func:`todotxtio.load_many`).
+
+    :rtype: list
+    """
+    return from_file(file_path, encoding)
+
+
+def _load_file_fields(file_path, encoding):
+    """Load a todo file to a list of parsed fields (see :func:`todotxtio._parse_fields`), which are cheaper to send
+    back from a process than todos.
+
     :rtype: list
     """
+    with _open_file(file_path, encoding) as stream, _gc_paused():
+        return [_parse_fields(line) for line in _iter_lines(stream)]
+
+
+def iter_stream(stream, close=True, memo=None, symbols=None):
+    """Lazily load a todo list from an already-opened stream.
+
+    The stream is read line by line, so only one line at a time is held in memory. The stream is closed (if asked
+    to) once the generator is exhausted.
+
+    :param file stream: A file-like object
+    :param bool close: Whetever to close the stream or not after all operation are finised
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`)
+    :rtype: generator
+    """
+    parse_line = _line_parser(memo, symbols)
+
+    try:
+        for line in _iter_lines(stream):
+            yield parse_line(line)
+    finally:
+        if close:
+            stream.close()
+
+
+def iter_file(file_path, encoding='utf-8', memory_map=False, memo=None, symbols=None):
+    """Lazily load a todo list from a file.
+
+    If ``memory_map`` is ``True``, the file is mapped in memory and its lines are decoded one at a time straight from
+    the mapped bytes, instead of being copied to an intermediate read buffer first. This is only done for encodings in
+    which a line break is encoded as a single ``\\n`` byte (like UTF-8).
+
+    :param str file_path: Path to the file
+    :param str encoding: The encoding of the file to open
+    :param bool memory_map: Whether to map the file in memory instead of reading it
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`)
+    :rtype: generator
+    """
     if not os.path.isfile(file_path):
         raise FileNotFoundError('File doesn\'t exists: ' + file_path)
 
+    if _stats is not None:
+        _stats.counters['bytes_read'] += os.path.getsize(file_path)
+
+    if memory_map and '\n'.encode(encoding) == b'\n':
+        parse_line = _line_parser(memo, symbols)
+
+        return (parse_line(line) for line in _iter_lines(_iter_mapped_file(file_path, encoding)))
+
     stream = open(file_path, 'r', encoding=encoding)
 
-    return from_stream(stream)
+    return iter_stream(stream, memo=memo, symbols=symbols)
 
 
-def from_string(string):
-    """Load a todo list from a string.
+def iter_string(string, memo=None, symbols=None):
+    """Lazily load a todo list from a string.
 
     :param str string: The string to parse
-    :rtype: list
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`)
+    :rtype: generator
     """
-    todos = []
+    parse_line = _line_parser(memo, symbols)
 
-    for line in string.strip().splitlines():
-        line = line.strip()
+    for line in _iter_lines(_split_string(string)):
+        yield parse_line(line)
 
-        todo_pre_data = todo_data_regex.match(line)
 
-        todo = Todo()
+def _split_string(string):
+    """Yield the newline-terminated chunks of a string without building a list of all of them."""
+    start = 0
 
-        if todo_pre_data:
-            todo.completed = todo_pre_data.group(1) == 'x'
+    while True:
+        end = string.find('\n', start)
 
-            if todo.completed:
-                todo.creation_date = todo_pre_data.group(4)
+        if end == -1:
+            break
 
-                if todo_pre_data.group(2):
-                    todo.completion_date = todo_pre_data.group(2)
-            else:
-                todo.creation_date = todo_pre_data.group(2)
+        yield string[start:end + 1]
 
-            todo.priority = todo_pre_data.group(3)
+        start = end + 1
 
-            text = todo_data_regex.sub('', line).strip()
-        else:
-            text = line
+    if start < len(string):
+        yield string[start:]
 
-        todo_projects = todo_project_regex.findall(text)
 
-        if len(todo_projects) > 0:
-            todo.projects = todo_projects
-            text = todo_project_regex.sub('', text).strip()
+def _iter_mapped_file(file_path, encoding):
+    """Yield the decoded lines of a file mapped in memory, line breaks included."""
+    with open(file_path, 'rb') as stream:
+        size = os.fstat(stream.fileno()).st_size
 
-        todo_contexts = todo_context_regex.findall(text)
+        if not size: # Empty files can't be mapped
+            return
 
-        if len(todo_contexts) > 0:
-            todo.contexts = todo_contexts
-            text = todo_context_regex.sub('', text).strip()
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
 
-        todo_tags = todo_tag_regex.findall(text)
+            while start < size:
+                end = mapped.find(b'\n', start)
+                end = size if end == -1 else end + 1
 
-        if len(todo_tags) > 0:
-            for todo_tag in todo_tags:
-                todo.tags[todo_tag[0]] = todo_tag[1]
+                yield mapped[start:end].decode(encoding)
 
-            text = todo_tag_regex.sub('', text).strip()
+                start = end
 
-        todo.text = text
 
-        todos.append(todo)
+def _iter_lines(chunks):
+    """Yield the stripped lines of a todo list from an iterable of raw text chunks (usually lines).
 
-    return todos
+    This yields exactly what ``string.strip().splitlines()`` would (each line being stripped as well): leading and
+    trailing blank lines are skipped, but blank lines in between todos are kept. Only the count of pending blank lines
+    is kept in memory.
+    """
+    lines = _LineSplitter().split(chunks)
 
+    return lines if _stats is None else _stats._count_lines(lines)
 
-def to_dicts(todos):
-    """Convert a list of :class:`todotxtio.Todo` objects to a list of todo dict.
 
-    :param list todos: List of :class:`todotxtio.Todo` objects
+class _LineSplitter:
+    """Split raw text chunks to stripped todo lines (see :func:`todotxtio._iter_lines`), the chunks being possibly
+    given by several successive calls to :meth:`todotxtio._LineSplitter.split`."""
+    def __init__(self):
+        self._state = (False, 0, False)
+
+    def split(self, chunks):
+        started, blanks, pending_cr = self._state
+
+        try:
+            for chunk in chunks:
+                if pending_cr and chunk.startswith('\n'): # A \r\n line break split across two chunks
+                    chunk = chunk[1:]
+
+                pending_cr = chunk.endswith('\r')
+
+                for line in chunk.splitlines():
+                    line = line.strip()
+
+                    if not line:
+                        if started:
+                            blanks += 1
+
+                        continue
+
+                    if blanks:
+                        for _ in range(blanks):
+                            yield ''
+
+                        blanks = 0
+
+                    started = True
+
+                    yield line
+        finally:
+            self._state = (started, blanks, pending_cr)
+
+
+def _split_file(file_path, parts, min_size=1024 * 1024):
+    """Split a file into byte ranges of about the same size, each of them ending with a line break.
+
+    :param str file_path: Path to the file
+    :param int parts: Number of ranges to split the file into
+    :param int min_size: Minimum size of a range
     :rtype: list
     """
-    return [todo.to_dict() for todo in todos]
+    size = os.path.getsize(file_path)
+    parts = max(1, min(parts, size // min_size))
+    ranges = []
+    start = 0
 
+    with open(file_path, 'rb') as stream:
+        for part in range(1, parts):
+            stream.seek(max(start, size * part // parts))
+            stream.readline()
 
-def to_stream(stream, todos, close=True):
-    """Write a list of todos to an already-opened stream.
+            end = stream.tell()
 
-    :param file stream: A file-like object
-    :param list todos: List of :class:`todotxtio.Todo` objects
-    :param bool close: Whetever to close the stream or not after all operation are finised
-    :rtype: None
+            if end >= size:
+                break
+
+            if end > start:
+                ranges.append((start, end))
+                start = end
+
+    ranges.append((start, size))
+
+    return ranges
+
+
+def _parallel_from_file(file_path, encoding, workers, ranges):
+    """Parse byte ranges of a file in a process pool and merge the results, in the file order.
+
+    :rtype: list
     """
-    stream.write(to_string(todos))
+    todos = []
 
-    if close:
-        stream.close()
+    with _gc_paused(), ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_parse_file_range, file_path, encoding, start, end) for start, end in ranges]
 
+        for future in futures:
+            todos.extend(Todo(*fields) if fields else None for fields in future.result())
 
-def to_file(file_path, todos, encoding='utf-8'):
-    """Write a list of todos to a file.
+    # Blank lines are kept as None so the ones at the beginning and at the end of the file can be removed, like when
+    # parsing the whole file at once
+    start = 0
+    end = len(todos)
 
-    :param str file_path: Path to the file
-    :param list todos: List of :class:`todotxtio.Todo` objects
-    :param str encoding: The encoding of the file to open
-    :rtype: None
+    while start < end and todos[start] is None:
+        start += 1
+
+    while end > start and todos[end - 1] is None:
+        end -= 1
+
+    return [todo if todo is not None else Todo('') for todo in islice(todos, start, end)]
+
+
+def _parse_file_range(file_path, encoding, start, end):
+    """Parse a byte range of a file to a list of parsed fields (see :func:`todotxtio._parse_fields`), with ``None``
+    for blank lines.
+
+    :rtype: list
     """
-    stream = open(file_path, 'w', encoding=encoding)
-    to_stream(stream, todos)
+    with open(file_path, 'rb') as stream:
+        stream.seek(start)
 
+        string = stream.read(end - start).decode(encoding)
 
-def to_string(todos):
-    """Convert a list of todos to a string.
+    with _gc_paused():
+        return [_parse_fields(line) if line else None for line in map(str.strip, string.splitlines())]
 
-    :param list todos: List of :class:`todotxtio.Todo` objects
-    :rtype: str
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_enabled = False
+
+
+@contextmanager
+def _gc_paused():
+    """Disable the garbage collector for the duration of the context, if it's enabled.
+
+    Building big lists of todos creates lots of container objects, which triggers many garbage collections walking
+    through all of them for nothing, as todos don't contain reference cycles. Pauses may overlap (from several threads
+    or coroutines): the garbage collector is only enabled back once the last of them ends.
     """
-    return '\n'.join([str(todo) for todo in todos])
+    global _gc_pauses, _gc_enabled
 
+    with _gc_lock:
+        if not _gc_pauses:
+            _gc_enabled = gc.isenabled()
 
-class Todo:
-    """Represent one todo.
+            gc.disable()
 
-    :param str text: The text of the todo
-    :param bool completed: Should this todo be marked as completed?
-    :param str completion_date: A date of completion, in the ``YYYY-MM-DD`` format. Setting this property will automatically set the ``completed`` attribute to ``True``.
-    :param str priority: The priority of the todo represented by a char between ``A-Z``
-    :param str creation_date: A date of creation, in the ``YYYY-MM-DD`` format
-    :param list projects: A list of projects without leading ``+``
-    :param list contexts: A list of projects without leading ``@``
-    :param dict tags: A dict of tags
+        _gc_pauses += 1
+
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+
+            if not _gc_pauses and _gc_enabled:
+                gc.enable()
+
+
+def _line_parser(memo, symbols):
+    """Return the function parsing a line to a todo, using the given memo of parsed lines or symbol table, if any."""
+    if _stats is not None:
+        return _stats._line_parser(memo, symbols)
+
+    if memo is not None:
+        return memo.parse if symbols is None else partial(memo.parse, symbols=symbols)
+
+    if symbols is None:
+        return _parse_line
+
+    return partial(_parse_line, intern=_interner(symbols))
+
+
+def _interner(symbols):
+    """Return the function interning a string in the given symbol table, mapping each string to itself."""
+    def intern(string):
+        return symbols.setdefault(string, string)
+
+    return intern
+
+
+def _parse_line(line, intern=sys.intern, mark=None):
+    """Parse a single, already stripped, todo line.
+
+    :param str line: The line to parse
+    :param callable intern: The function used to intern projects, contexts, tag names and dates
+    :param callable mark: Called at the end of each parsing phase (see :func:`todotxtio._parse_fields`)
+    :rtype: todotxtio.Todo
+    """
+    if mark is None:
+        return Todo(*_parse_fields(line, intern))
+
+    todo = Todo(*_parse_fields(line, intern, mark))
+
+    mark('construct')
+
+    return todo
+
+
+def _parse_fields(line, intern=sys.intern, mark=None):
+    """Parse a single, already stripped, todo line to a tuple of values, in the :class:`todotxtio.Todo` constructor
+    arguments order.
+
+    If given, ``mark`` is called with the name of each parsing phase once it's over (``prefix``, then ``extract``),
+    and with the parser the text was given to (``tokenized`` or ``regex_parsed``), to record statistics.
+
+    :param str line: The line to parse
+    :param callable intern: The function used to intern projects, contexts, tag names and dates
+    :param callable mark: Called at the end of each parsing phase
+    :rtype: tuple
     """
-    text = None
-    completed = False
-    completion_date = None
-    priority = None
-    creation_date = None
+    completed, completion_date, priority, creation_date, text = _parse_prefix(line, intern)
+
+    if text.isprintable():
+        if mark is not None:
+            mark('prefix', 'tokenized')
+
+        text, projects, contexts, tags = _tokenize_text(text, intern)
+    else:
+        if mark is not None:
+            mark('prefix', 'regex_parsed')
+
+        text, projects, contexts, tags = _regex_parse_text(text, intern)
+
+    if mark is not None:
+        mark('extract')
+
+    return text, completed, completion_date, priority, creation_date, projects, contexts, tags
+
+
+def _parse_prefix(line, intern=sys.intern):
+    """Parse the completion mark, the priority and the dates at the beginning of a single, already stripped, todo line.
+
+    :param str line: The line to parse
+    :param callable intern: The function used to intern dates
+    :rtype: tuple
+    """
+    todo_pre_data = todo_data_regex.match(line)
+
+    completed, completion_date, priority, creation_date = todo_pre_data.group(1, 2, 3, 4)
+
+    if completed:
+        completed = True
+    else:
+        completed = False
+        creation_date = completion_date # Without the completion mark, the first date is the creation one
+        completion_date = None
+
+    if completion_date:
+        completion_date = intern(completion_date)
+
+    if creation_date:
+        creation_date = intern(creation_date)
+
+    return completed, completion_date, priority, creation_date, line[todo_pre_data.end():].strip()
+
+
+def _tokenize_text(text, intern=sys.intern):
+    """Extract projects, contexts and tags from a todo text in a single pass over its space-separated tokens.
+
+    Yields exactly the same results as :func:`todotxtio._regex_parse_text`, but only for texts which doesn't contain
+    any other whitespace than plain spaces (see :meth:`str.isprintable`).
+
+    :param str text: The todo text, without its completion, priority and dates data
+    :param callable intern: The function used to intern projects, contexts and tag names
+    :rtype: tuple
+    """
+    tokens = text.split(' ')
+
+    if len(tokens) == 1: # The first token is never a project, a context nor a tag
+        return text, None, None, None
+
     projects = []
     contexts = []
     tags = {}
+    kept = [tokens[0]]
 
-    def __init__(self, text=None, completed=False, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None):
-        self.text = text
-        self.completed = completed
-
-        if completion_date and self.completed:
-            self.completion_date = completion_date
+    for token in islice(tokens, 1, None):
+        first = token[:1]
 
-        self.priority = priority
-        self.creation_date = creation_date
-        self.projects = projects
-        self.contexts = contexts
-        self.tags = tags
+        if first == '+' and len(token) > 1:
+            projects.append(intern(token[1:]))
+        elif first == '@' and len(token) > 1:
+            contexts.append(intern(token[1:]))
+        elif ':' not in token:
+            kept.append(token)
+        else:
+            colon = token.rfind(':')
 
-    def to_dict(self):
-        """Return a dict representation of this Todo instance.
+            # Tag keys are greedy: the tag is split on the last colon being followed by a valid value
+            while colon > 0 and (colon == len(token) - 1 or token[colon + 1] == '/'):
+                colon = token.rfind(':', 0, colon)
 
-        :rtype: dict
-        """
-        return {
-            'text': self.text,
-            'completed': self.completed,
-            'completion_date': self.completion_date,
-            'priority': self.priority,
-            'creation_date': self.creation_date,
-            'projects': self.projects,
-            'contexts': self.contexts,
-            'tags': self.tags,
-        }
+            if colon > 0:
+                slash = token.find('/', colon + 1)
 
-    def __setattr__(self, name, value):
-        if name == 'completed':
-            if not value:
-                super().__setattr__('completion_date', None) # Uncompleted todo must not have any completion date
-        elif name == 'completion_date':
-            if value:
-                super().__setattr__('completed', True) # Setting the completion date must set this todo as completed...
+                if slash == -1:
+                    tags[intern(token[:colon])] = token[colon + 1:]
+                else: # Tag values stop at the first slash, what's left is glued to the previous token
+                    tags[intern(token[:colon])] = token[colon + 1:slash]
+                    kept[-1] += token[slash:]
             else:
-                super().__setattr__('completed', False) # ...and vice-versa
-        elif name in ['projects', 'contexts']:
-            if not value:
-                super().__setattr__(name, []) # Force contexts, projects to be lists when setting them to a falsely value
-                return
-            elif type(value) is not list: # Make sure, otherwise, that the provided value is a list
-                raise ValueError(name + ' should be a list')
-        elif name == 'tags':
-            if not value:
-                super().__setattr__(name, {}) # Force tags to be a dict when setting them to a falsely value
-                return
-            elif type(value) is not dict: # Make sure, otherwise, that the provided value is a dict
-                raise ValueError(name + ' should be a dict')
+                kept.append(token)
 
-        super().__setattr__(name, value)
+    if len(kept) < len(tokens):
+        text = ' '.join(kept).strip()
 
-    def __str__(self):
-        """Convert this Todo object in a valid Todo.txt line."""
-        ret = []
+    return text, projects, contexts, tags
 
-        if self.completed:
-            ret.append('x')
 
-        if self.completion_date:
-            ret.append(self.completion_date)
+def _regex_parse_text(text, intern=sys.intern):
+    """Extract projects, contexts and tags from a todo text using regular expressions.
 
-        if self.priority:
-            ret.append('(' + self.priority + ')')
+    :param str text: The todo text, without its completion, priority and dates data
+    :param callable intern: The function used to intern projects, contexts and tag names
+    :rtype: tuple
+    """
+    todo_projects = list(map(intern, todo_project_regex.findall(text)))
 
-        if self.creation_date:
-            ret.append(self.creation_date)
+    if len(todo_projects) > 0:
+        text = todo_project_regex.sub('', text).strip()
 
-        ret.append(self.text)
+    todo_contexts = list(map(intern, todo_context_regex.findall(text)))
 
-        if self.projects:
-            ret.append(''.join([' +' + project for project in self.projects]).strip())
+    if len(todo_contexts) > 0:
+        text = todo_context_regex.sub('', text).strip()
 
-        if self.contexts:
-            ret.append(''.join([' @' + context for context in self.contexts]).strip())
+    todo_tags = todo_tag_regex.findall(text)
 
-        if self.tags:
-            ret.append(''.join([' ' + tag_name + ':' + tag_value for tag_name, tag_value in self.tags.items()]).strip())
+    if len(todo_tags) > 0:
+        text = todo_tag_regex.sub('', text).strip()
 
-        return ' '.join(ret)
+    return text, todo_projects, todo_contexts, {intern(tag_name): tag_value for tag_name, tag_value in todo_tags}
 
-    def __repr__(self):
-        """Call the __str__ method to return a textual representation of this Todo object."""
-        return self.__str__()
 
+def to_dicts(todos, copy=False):
+    """Convert a list of :class:`todotxtio.Todo` objects to a list of todo dict.
 
-def search(todos, text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None):
-    """Return a list of todos that matches the provided filters.
+    Todo dicts share their projects, contexts and tags containers with the todos unless ``copy`` is set.
 
-    It takes the exact same parameters as the :class:`todotxtio.Todo` object constructor, and return a list of :class:`todotxtio.Todo` objects as well.
-    All criteria defaults to ``None`` which means that the criteria is ignored.
+    :param list todos: List of :class:`todotxtio.Todo` objects
+    :param bool copy: Whether to copy the projects, contexts and tags containers
+    :rtype: list
+    """
+    if copy:
+        return [dict(zip(todo_fields, fields)) for fields in _copy_fields(todos)]
 
-    A todo will be returned in the results list if all of the criteria matches. From the moment when a todo is sent in the results list, it will
-    never be checked again.
+    return [todo.to_dict() for todo in todos]
 
-    :param str text: String to be found in the todo text
-    :param bool completed: Search for completed/uncompleted todos only
-    :param str completion_date: Match this completion date
-    :param list priority: List of priorities to match
-    :param str creation_date: Match this creation date
-    :param list projects: List of projects to match
-    :param list contexts: List of contexts to match
-    :param dict tags: Dict of tag to match
+
+def to_tuples(todos, copy=False):
+    """Convert a list of :class:`todotxtio.Todo` objects to a list of tuples of their values, in the
+    :data:`todotxtio.todo_fields` order.
+
+    This is faster than :func:`todotxtio.to_dicts`, and so is serializing the result (to JSON, for example), as field
+    names aren't repeated for every todo. Tuples share their projects, contexts and tags containers with the todos
+    unless ``copy`` is set.
+
+    :param list todos: List of :class:`todotxtio.Todo` objects
+    :param bool copy: Whether to copy the projects, contexts and tags containers
     :rtype: list
     """
-    results = []
+    if copy:
+        return list(_copy_fields(todos))
 
-    for todo in todos:
-        text_match = completed_match = completion_date_match = priority_match = creation_date_match = projects_match = contexts_match = tags_match =True
+    return list(map(_todo_fields, todos))
 
-        if text is not None:
-            text_match = text in todo.text
 
-        if completed is not None:
-            completed_match = todo.completed == completed
+def _copy_fields(todos):
+    """Yield the values of the given todos, in the :data:`todotxtio.todo_fields` order, with copies of their projects,
+    contexts and tags containers."""
+    for text, completed, completion_date, priority, creation_date, projects, contexts, tags in map(_todo_fields, todos):
+        yield text, completed, completion_date, priority, creation_date, projects[:], contexts[:], tags.copy()
 
-        if completion_date is not None:
-            completion_date_match = todo.completion_date == completion_date
 
-        if priority is not None:
-            priority_match = todo.priority in priority
+_todo_fields = operator.attrgetter(*todo_fields)
+_dict_fields = operator.itemgetter(*todo_fields)
 
-        if creation_date is not None:
-            creation_date_match = todo.creation_date == creation_date
 
-        if projects is not None:
-            projects_match = any(i in projects for i in todo.projects)
+def to_stream(stream, todos, close=True, batch_size=1000):
+    """Write a list of todos to an already-opened stream.
 
-        if contexts is not None:
-            contexts_match = any(i in contexts for i in todo.contexts)
+    Todos are converted and written by batches, so the whole output is never held in memory. Any iterable of todos can
+    be written this way, like the ones returned by :func:`todotxtio.isearch`.
 
-        if tags is not None:
-            tags_match = any(todo.tags[k] == v for k, v in tags.items() if k in todo.tags)
+    :param file stream: A file-like object
+    :param list todos: List of :class:`todotxtio.Todo` objects
+    :param bool close: Whetever to close the stream or not after all operation are finised
+    :param int batch_size: Number of todos to write at once
+    :rtype: None
+    """
+    lines = map(str, todos)
+    separator = ''
+    stats = _stats
 
-        if text_match and completed_match and completion_date_match and priority_match and creation_date_match and projects_match and contexts_match and tags_match:
-            results.append(todo)
+    while True:
+        if stats is not None:
+            start = time.perf_counter()
 
-    return results
+        batch = list(islice(lines, batch_size))
+
+        if not batch:
+            break
+
+        text = separator + '\n'.join(batch)
+
+        if stats is None:
+            stream.write(text)
+        else:
+            formatted = time.perf_counter()
+
+            stream.write(text)
+
+            stats._count_written(len(batch), len(text), formatted - start, time.perf_counter() - formatted)
+
+        separator = '\n'
+
+    if close:
+        stream.close()
+
+
+def to_file(file_path, todos, encoding='utf-8'):
+    """Write a list of todos to a file.
+
+    :param str file_path: Path to the file
+    :param list todos: List of :class:`todotxtio.Todo` objects
+    :param str encoding: The encoding of the file to open
+    :rtype: None
+    """
+    stream = open(file_path, 'w', encoding=encoding)
+    to_stream(stream, todos)
+
+
+def to_string(todos):
+    """Convert a list of todos to a string.
+
+    :param list todos: List of :class:`todotxtio.Todo` objects
+    :rtype: str
+    """
+    if _stats is not None:
+        start = time.perf_counter()
+        lines = list(map(str, todos))
+        string = '\n'.join(lines)
+
+        _stats._count_written(len(lines), len(string), time.perf_counter() - start, 0)
+
+        return string
+
+    return '\n'.join(map(str, todos))
+
+
+def to_snapshot(snapshot_path, todos, file_path=None):
+    """Write a todo list to a binary snapshot, which is much faster to load than parsing the todo file again.
+
+    The columns of a :class:`todotxtio.TodoTable` are written as is, so projects, contexts and tags are stored once in
+    a symbol table and dates as integers. If ``file_path`` is given, the size, modification time and hash of this todo
+    file are recorded in the snapshot, so :func:`todotxtio.from_snapshot` can tell when the snapshot is stale. The
+    snapshot is written to a temporary file first, which then atomically replaces the previous snapshot.
+
+    Texts, projects, contexts and tag names and values must be strings.
+
+    :param str snapshot_path: Path to the snapshot
+    :param list todos: List of :class:`todotxtio.Todo` objects, or a :class:`todotxtio.TodoTable`
+    :param str file_path: Path to the todo file the todos were loaded from
+    :rtype: None
+    """
+    table = todos if isinstance(todos, TodoTable) else TodoTable(todos)
+
+    if file_path is None:
+        signature = (-1, 0, bytes(20))
+    else:
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError('File doesn\'t exists: ' + file_path)
+
+        stat = os.stat(file_path)
+
+        with open(file_path, 'rb') as stream:
+            signature = (stat.st_size, stat.st_mtime_ns, hashlib.sha1(stream.read()).digest())
+
+    _write_snapshot(snapshot_path, table, signature)
+
+
+async def afrom_stream(stream, close=True, encoding='utf-8', batch_size=1000, executor=None, memo=None, symbols=None):
+    """Load a todo list from an already-opened stream without blocking the event loop.
+
+    See :func:`todotxtio.aiter_stream` for the kind of streams that are supported.
+
+    :param stream: A file-like object or an asynchronous iterable of lines (or chunks) of text
+    :param bool close: Whetever to close the stream or not after all operation are finised
+    :param str encoding: The encoding used to decode the stream if it gives bytes
+    :param int batch_size: Number of lines to read and parse at once
+    :param concurrent.futures.ThreadPoolExecutor executor: The executor to run blocking work in (the default executor of the loop if ``None``)
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`)
+    :rtype: list
+    """
+    batches = _aiter_batches(stream, encoding, batch_size, executor, memo, symbols)
+    todos = []
+
+    try:
+        async for batch in batches: # The GC is only paused while parsing each batch, not across awaits
+            todos.extend(batch)
+    except BaseException:
+        await batches.aclose()
+
+        if close:
+            await _aclose(stream, executor)
+
+        raise
+
+    if close: # Only once all the todos have been parsed
+        await _aclose(stream, executor)
+
+    return todos
+
+
+async def afrom_file(file_path, encoding='utf-8', batch_size=1000, executor=None, memo=None, symbols=None):
+    """Load a todo list from a file without blocking the event loop.
+
+    :param str file_path: Path to the file
+    :param str encoding: The encoding of the file to open
+    :param int batch_size: Number of lines to read and parse at once
+    :param concurrent.futures.ThreadPoolExecutor executor: The executor to run blocking work in (the default executor of the loop if ``None``)
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`)
+    :rtype: list
+    """
+    stream = await asyncio.get_running_loop().run_in_executor(executor, _open_file, file_path, encoding)
+
+    return await afrom_stream(stream, batch_size=batch_size, executor=executor, memo=memo, symbols=symbols)
+
+
+async def aiter_stream(stream, close=True, encoding='utf-8', batch_size=1000, executor=None, memo=None, symbols=None):
+    """Lazily load a todo list from an already-opened stream without blocking the event loop.
+
+    The stream may either be a regular file-like object, whose lines are then read in the executor, or an asynchronous
+    iterable of lines (or arbitrary chunks) of text, like an :class:`asyncio.StreamReader`. Bytes are decoded using
+    ``encoding``. Lines are parsed in the executor by batches of ``batch_size``, so the event loop is only held for a
+    short time per batch. The stream is closed (if asked to, and if it has a ``close()`` method) once the generator is
+    exhausted.
+
+    :param stream: A file-like object or an asynchronous iterable of lines (or chunks) of text
+    :param bool close: Whetever to close the stream or not after all operation are finised
+    :param str encoding: The encoding used to decode the stream if it gives bytes
+    :param int batch_size: Number of lines to read and parse at once
+    :param concurrent.futures.ThreadPoolExecutor executor: The executor to run blocking work in (the default executor of the loop if ``None``)
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`)
+    :rtype: async_generator
+    """
+    batches = _aiter_batches(stream, encoding, batch_size, executor, memo, symbols)
+
+    try:
+        async for batch in batches:
+            for todo in batch:
+                yield todo
+    finally:
+        await batches.aclose()
+
+        if close:
+            await _aclose(stream, executor)
+
+
+async def aiter_file(file_path, encoding='utf-8', batch_size=1000, executor=None, memo=None, symbols=None):
+    """Lazily load a todo list from a file without blocking the event loop.
+
+    :param str file_path: Path to the file
+    :param str encoding: The encoding of the file to open
+    :param int batch_size: Number of lines to read and parse at once
+    :param concurrent.futures.ThreadPoolExecutor executor: The executor to run blocking work in (the default executor of the loop if ``None``)
+    :param todotxtio.LineMemo memo: Memo of already parsed lines to reuse
+    :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in (see :func:`todotxtio.from_string`)
+    :rtype: async_generator
+    """
+    stream = await asyncio.get_running_loop().run_in_executor(executor, _open_file, file_path, encoding)
+    todos = aiter_stream(stream, batch_size=batch_size, executor=executor, memo=memo, symbols=symbols)
+
+    try:
+        async for todo in todos:
+            yield todo
+    finally:
+        await todos.aclose()
+
+
+async def ato_stream(stream, todos, close=True, batch_size=1000, executor=None, encoding='utf-8'):
+    """Write a list of todos to an already-opened stream without blocking the event loop.
+
+    Todos are converted to text in the executor by batches of ``batch_size``. Each batch is then either awaited if the
+    ``write()`` method of the stream is a coroutine, written from the event loop (then awaiting its ``drain()`` method)
+    if it's an asyncio stream like an :class:`asyncio.StreamWriter`, or written in the executor. Todos may also be
+    given by an asynchronous iterable, like the one returned by :func:`todotxtio.aiter_file`.
+
+    Text is encoded using ``encoding`` for asyncio streams and binary file-like objects.
+
+    :param stream: A file-like object, possibly with coroutine ``write()`` and ``close()`` methods, or an asyncio stream
+    :param todos: Iterable or asynchronous iterable of :class:`todotxtio.Todo` objects
+    :param bool close: Whetever to close the stream or not after all operation are finised
+    :param int batch_size: Number of todos to write at once
+    :param concurrent.futures.ThreadPoolExecutor executor: The executor to run blocking work in (the default executor of the loop if ``None``)
+    :param str encoding: The encoding to write text in if the stream takes bytes
+    :rtype: None
+    """
+    loop = asyncio.get_running_loop()
+    async_write = inspect.iscoroutinefunction(stream.write)
+    drain = getattr(stream, 'drain', None) # Asyncio streams aren't thread-safe, so they're written from the loop
+    encoder = codecs.getincrementalencoder(encoding)() if drain is not None or isinstance(stream, (io.RawIOBase, io.BufferedIOBase)) else None
+
+    if hasattr(todos, '__aiter__'):
+        todos = todos.__aiter__()
+
+        async def take():
+            batch = []
+
+            try:
+                while len(batch) < batch_size:
+                    batch.append(await todos.__anext__())
+            except StopAsyncIteration:
+                pass
+
+            return batch
+    else:
+        todos = iter(todos)
+
+        def take():
+            return loop.run_in_executor(executor, list, islice(todos, batch_size))
+
+    def write(text):
+        stream.write(text)
+
+    def convert(batch, separator):
+        text = separator + to_string(batch)
+
+        return text if encoder is None else encoder.encode(text) # Batches are encoded one after the other
+
+    separator = ''
+
+    try:
+        while True:
+            batch = await take()
+
+            if not batch:
+                break
+
+            text = await loop.run_in_executor(executor, convert, batch, separator)
+
+            if async_write:
+                await stream.write(text)
+            elif drain is not None:
+                stream.write(text)
+
+                await drain()
+            else:
+                await loop.run_in_executor(executor, write, text)
+
+            separator = '\n'
+    finally:
+        if close:
+            await _aclose(stream, executor)
+
+
+async def ato_file(file_path, todos, encoding='utf-8', batch_size=1000, executor=None):
+    """Write a list of todos to a file without blocking the event loop.
+
+    :param str file_path: Path to the file
+    :param todos: Iterable or asynchronous iterable of :class:`todotxtio.Todo` objects
+    :param str encoding: The encoding of the file to open
+    :param int batch_size: Number of todos to write at once
+    :param concurrent.futures.ThreadPoolExecutor executor: The executor to run blocking work in (the default executor of the loop if ``None``)
+    :rtype: None
+    """
+    stream = await asyncio.get_running_loop().run_in_executor(executor, partial(open, file_path, 'w', encoding=encoding))
+
+    await ato_stream(stream, todos, batch_size=batch_size, executor=executor)
+
+
+async def _aiter_batches(stream, encoding, batch_size, executor, memo, symbols):
+    """Yield the lists of todos parsed, in the executor, from successive batches of lines of a stream."""
+    loop = asyncio.get_running_loop()
+    parse_line = _line_parser(memo, symbols)
+    splitter = _LineSplitter()
+    decoder = codecs.getincrementaldecoder(encoding)()
+    tail = ''
+
+    def parse_batch(chunks, final):
+        nonlocal tail
+
+        texts = [chunk if isinstance(chunk, str) else decoder.decode(chunk) for chunk in chunks]
+
+        if final:
+            texts.append(decoder.decode(b'', True))
+
+        lines = (tail + ''.join(texts)).splitlines(True)
+        tail = ''
+
+        # Chunks may end in the middle of a line, which is then kept for the next batch
+        if not final and lines and lines[-1].splitlines()[0] == lines[-1]:
+            tail = lines.pop()
+
+        lines = splitter.split(lines)
+
+        if _stats is not None:
+            lines = _stats._count_lines(lines)
+
+        with _gc_paused():
+            return [parse_line(line) for line in lines]
+
+    if hasattr(stream, '__aiter__'):
+        chunks = stream.__aiter__()
+
+        async def read_batch():
+            batch = []
+
+            try:
+                while len(batch) < batch_size:
+                    batch.append(await chunks.__anext__())
+            except StopAsyncIteration:
+                return await loop.run_in_executor(executor, parse_batch, batch, True), True
+
+            return await loop.run_in_executor(executor, parse_batch, batch, False), False
+    else:
+        def read_lines():
+            batch = list(islice(stream, batch_size))
+
+            return parse_batch(batch, not batch), not batch
+
+        def read_batch():
+            return loop.run_in_executor(executor, read_lines)
+
+    while True:
+        todos, done = await read_batch()
+
+        if todos:
+            yield todos
+
+        if done:
+            break
+
+
+async def _aclose(stream, executor):
+    """Close a stream, in the executor unless its ``close()`` method is a coroutine or it's an asyncio stream.
+
+    Streams without a ``close()`` method, like an :class:`asyncio.StreamReader`, are left as is.
+    """
+    close = getattr(stream, 'close', None)
+
+    if close is None:
+        return
+
+    if inspect.iscoroutinefunction(close):
+        await close()
+    elif hasattr(stream, 'wait_closed'): # Asyncio streams must be closed from the loop thread
+        close()
+
+        await stream.wait_closed()
+    else:
+        await asyncio.get_running_loop().run_in_executor(executor, close)
+
+
+def _open_file(file_path, encoding):
+    """Open a todo file for reading, checking it exists first."""
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError('File doesn\'t exists: ' + file_path)
+
+    return open(file_path, 'r', encoding=encoding)
+
+
+class Todo:
+    """Represent one todo.
+
+    Fields are stored in slots to keep instances small. The ``projects``, ``contexts`` and ``tags`` containers are
+    only created when they are first accessed.
+
+    :param str text: The text of the todo
+    :param bool completed: Should this todo be marked as completed?
+    :param str completion_date: A date of completion, in the ``YYYY-MM-DD`` format. Setting this property will automatically set the ``completed`` attribute to ``True``.
+    :param str priority: The priority of the todo represented by a char between ``A-Z``
+    :param str creation_date: A date of creation, in the ``YYYY-MM-DD`` format
+    :param list projects: A list of projects without leading ``+``
+    :param list contexts: A list of projects without leading ``@``
+    :param dict tags: A dict of tags
+    """
+    __slots__ = ('text', '_completed', '_completion_date', 'priority', 'creation_date', '_projects', '_contexts', '_tags')
+
+    def __init__(self, text=None, completed=False, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None):
+        self.text = text
+        self._completed = completed
+
+        if completion_date and completed:
+            self._completion_date = completion_date
+            self._completed = True
+        else:
+            self._completion_date = None
+
+        self.priority = priority
+        self.creation_date = creation_date
+        self._projects = projects if projects and type(projects) is list else _check_container('projects', projects, list)
+        self._contexts = contexts if contexts and type(contexts) is list else _check_container('contexts', contexts, list)
+        self._tags = tags if tags and type(tags) is dict else _check_container('tags', tags, dict)
+
+    @property
+    def completed(self):
+        return self._completed
+
+    @completed.setter
+    def completed(self, value):
+        if not value:
+            self._completion_date = None # Uncompleted todo must not have any completion date
+
+        self._completed = value
+
+    @property
+    def completion_date(self):
+        return self._completion_date
+
+    @completion_date.setter
+    def completion_date(self, value):
+        self._completed = bool(value) # Setting the completion date must set this todo as completed, and vice-versa
+        self._completion_date = value
+
+    @property
+    def parsed_completion_date(self):
+        """The completion date as a :class:`datetime.date`, or ``None`` if there's none or if it's not a valid
+        ``YYYY-MM-DD`` date. Parsed dates are cached, for up to 65536 distinct date strings."""
+        return _date_value(self._completion_date)
+
+    @property
+    def parsed_creation_date(self):
+        """The creation date as a :class:`datetime.date`, or ``None`` if there's none or if it's not a valid
+        ``YYYY-MM-DD`` date. Parsed dates are cached, for up to 65536 distinct date strings."""
+        return _date_value(self.creation_date)
+
+    @property
+    def projects(self):
+        if self._projects is None:
+            self._projects = []
+
+        return self._projects
+
+    @projects.setter
+    def projects(self, value):
+        self._projects = _check_container('projects', value, list)
+
+    @property
+    def contexts(self):
+        if self._contexts is None:
+            self._contexts = []
+
+        return self._contexts
+
+    @contexts.setter
+    def contexts(self, value):
+        self._contexts = _check_container('contexts', value, list)
+
+    @property
+    def tags(self):
+        if self._tags is None:
+            self._tags = {}
+
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        self._tags = _check_container('tags', value, dict)
+
+    def to_dict(self):
+        """Return a dict representation of this Todo instance.
+
+        :rtype: dict
+        """
+        return {
+            'text': self.text,
+            'completed': self._completed,
+            'completion_date': self._completion_date,
+            'priority': self.priority,
+            'creation_date': self.creation_date,
+            'projects': self.projects,
+            'contexts': self.contexts,
+            'tags': self.tags,
+        }
+
+    def __str__(self):
+        """Convert this Todo object in a valid Todo.txt line."""
+        ret = []
+
+        if self._completed:
+            ret.append('x')
+
+        if self._completion_date:
+            ret.append(self._completion_date)
+
+        if self.priority:
+            ret.append('(' + self.priority + ')')
+
+        if self.creation_date:
+            ret.append(self.creation_date)
+
+        ret.append(self.text)
+
+        if self._projects:
+            ret.append(('+' + ' +'.join(self._projects)).rstrip())
+
+        if self._contexts:
+            ret.append(('@' + ' @'.join(self._contexts)).rstrip())
+
+        if self._tags:
+            ret.append(' '.join([tag_name + ':' + tag_value for tag_name, tag_value in self._tags.items()]).strip())
+
+        return ' '.join(ret)
+
+    def __repr__(self):
+        """Call the __str__ method to return a textual representation of this Todo object."""
+        return self.__str__()
+
+
+def _check_container(name, value, container_type):
+    """Validate a todo projects, contexts or tags container.
+
+    Falsy values are stored as ``None``, the actual empty container being created when first accessed.
+
+    :param str name: Name of the todo attribute
+    :param value: The container to check
+    :param type container_type: Either ``list`` or ``dict``
+    :rtype: list, dict or None
+    """
+    if not value:
+        return None
+    elif type(value) is not container_type: # Make sure, otherwise, that the provided value is of the right type
+        raise ValueError(name + ' should be a ' + container_type.__name__)
+
+    return value
+
+
+def search(todos, text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None, creation_date_range=None, completion_date_range=None):
+    """Return a list of todos that matches the provided filters.
+
+    It takes the exact same parameters as the :class:`todotxtio.Todo` object constructor, and return a list of :class:`todotxtio.Todo` objects as well.
+    All criteria defaults to ``None`` which means that the criteria is ignored.
+
+    A todo will be returned in the results list if all of the criteria matches. From the moment when a todo is sent in the results list, it will
+    never be checked again.
+
+    If a :class:`todotxtio.TodoTable` is given instead of a list, a :class:`todotxtio.TodoTable` is returned. If a
+    :class:`todotxtio.TodoIndex` is given, the search is answered using its index.
+
+    Date ranges are given as ``(start, end)`` pairs of :class:`datetime.date` objects or ``YYYY-MM-DD`` strings. Todos
+    with a date which isn't a valid ``YYYY-MM-DD`` one never match a date range.
+
+    Criteria are compiled to a :class:`todotxtio.Query` on every call: use :func:`todotxtio.compile_query` to search
+    with the same criteria again and again.
+
+    :param str text: String to be found in the todo text
+    :param bool completed: Search for completed/uncompleted todos only
+    :param str completion_date: Match this completion date
+    :param list priority: List of priorities to match
+    :param str creation_date: Match this creation date
+    :param list projects: List of projects to match
+    :param list contexts: List of contexts to match
+    :param dict tags: Dict of tag to match
+    :param tuple creation_date_range: Match creation dates between these two dates (included), ``None`` meaning no limit
+    :param tuple completion_date_range: Match completion dates between these two dates (included), ``None`` meaning no limit
+    :rtype: list
+    """
+    return Query(text, completed, completion_date, priority, creation_date, projects, contexts, tags, creation_date_range, completion_date_range)(todos)
+
+
+def isearch(todos, text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None, creation_date_range=None, completion_date_range=None):
+    """Lazily yield the todos that matches the provided filters.
+
+    Same as :func:`todotxtio.search`, but matching todos are yielded as they are found. Any iterable of todos can be
+    searched this way, like the generators returned by :func:`todotxtio.iter_file`.
+
+    :rtype: iterator
+    """
+    return Query(text, completed, completion_date, priority, creation_date, projects, contexts, tags, creation_date_range, completion_date_range).iter(todos)
+
+
+def count(todos, text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None, creation_date_range=None, completion_date_range=None):
+    """Return the number of todos that matches the provided filters, without building the list of them.
+
+    Takes the same criteria as :func:`todotxtio.search`.
+
+    :rtype: int
+    """
+    return Query(text, completed, completion_date, priority, creation_date, projects, contexts, tags, creation_date_range, completion_date_range).count(todos)
+
+
+def exists(todos, text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None, creation_date_range=None, completion_date_range=None):
+    """Return whether at least one todo matches the provided filters, stopping at the first one found.
+
+    Takes the same criteria as :func:`todotxtio.search`.
+
+    :rtype: bool
+    """
+    return Query(text, completed, completion_date, priority, creation_date, projects, contexts, tags, creation_date_range, completion_date_range).exists(todos)
+
+
+def compile_query(text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None, creation_date_range=None, completion_date_range=None):
+    """Compile search criteria to a reusable :class:`todotxtio.Query` object.
+
+    Takes the same criteria as :func:`todotxtio.search`.
+
+    :rtype: todotxtio.Query
+    """
+    return Query(text, completed, completion_date, priority, creation_date, projects, contexts, tags, creation_date_range, completion_date_range)
+
+
+class Query:
+    """Search criteria compiled once to be matched against todos over and over.
+
+    Criteria are normalized to sets, and only the ones which are set are checked, the cheapest ones first. Use
+    :func:`todotxtio.compile_query` to create one.
+
+    Calling a query with a todo list returns the list of matching todos, exactly like :func:`todotxtio.search` would.
+    Its ``match`` attribute is a function returning whether a single todo matches the query.
+    """
+    def __init__(self, text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None, creation_date_range=None, completion_date_range=None):
+        self.criteria = (text, completed, completion_date, priority, creation_date, projects, contexts, tags, creation_date_range, completion_date_range)
+
+        checks = []
+        names = []
+
+        if completed is not None:
+            names.append('completed')
+            checks.append(lambda todo: todo._completed == completed)
+
+        if priority is not None:
+            priorities = _to_set(priority)
+
+            names.append('priority')
+            checks.append(lambda todo: todo.priority in priorities)
+
+        if completion_date is not None:
+            names.append('completion_date')
+            checks.append(lambda todo: todo._completion_date == completion_date)
+
+        if creation_date is not None:
+            names.append('creation_date')
+            checks.append(lambda todo: todo.creation_date == creation_date)
+
+        if completion_date_range is not None:
+            completion_start, completion_end = _to_date_range('completion_date_range', completion_date_range)
+
+            names.append('completion_date_range')
+            checks.append(lambda todo: _in_date_range(_date_value(todo._completion_date), completion_start, completion_end))
+
+        if creation_date_range is not None:
+            creation_start, creation_end = _to_date_range('creation_date_range', creation_date_range)
+
+            names.append('creation_date_range')
+            checks.append(lambda todo: _in_date_range(_date_value(todo.creation_date), creation_start, creation_end))
+
+        if projects is not None:
+            projects = _to_set(projects)
+
+            names.append('projects')
+            checks.append(lambda todo: todo._projects is not None and _intersects(projects, todo._projects))
+
+        if contexts is not None:
+            contexts = _to_set(contexts)
+
+            names.append('contexts')
+            checks.append(lambda todo: todo._contexts is not None and _intersects(contexts, todo._contexts))
+
+        if tags is not None:
+            tags = list(tags.items())
+
+            names.append('tags')
+            checks.append(lambda todo: todo._tags is not None and any(todo._tags.get(k, _missing) == v for k, v in tags))
+
+        if text is not None:
+            names.append('text')
+            checks.append(lambda todo: text in todo.text)
+
+        self._checks = list(zip(names, checks))
+
+        if not checks:
+            self.match = lambda todo: True
+        elif len(checks) == 1:
+            self.match = checks[0]
+        else:
+            def match(todo):
+                for check in checks:
+                    if not check(todo):
+                        return False
+
+                return True
+
+            self.match = match
+
+    def iter(self, todos):
+        """Lazily yield the todos matching this query.
+
+        :param iterable todos: :class:`todotxtio.Todo` objects
+        :rtype: iterator
+        """
+        if isinstance(todos, (TodoTable, TodoIndex)):
+            return iter(self(todos))
+
+        return filter(self.match if _stats is None else _stats._matcher(self._checks), todos)
+
+    def count(self, todos):
+        """Return the number of todos matching this query.
+
+        :param iterable todos: :class:`todotxtio.Todo` objects
+        :rtype: int
+        """
+        if _stats is not None:
+            return len(self._search(todos, True))
+
+        if isinstance(todos, TodoTable):
+            return len(todos._match(*self.criteria))
+        elif isinstance(todos, TodoIndex):
+            return len(todos.search(*self.criteria))
+
+        return sum(1 for _ in filter(self.match, todos))
+
+    def exists(self, todos):
+        """Return whether at least one todo matches this query, stopping at the first one found.
+
+        :param iterable todos: :class:`todotxtio.Todo` objects
+        :rtype: bool
+        """
+        if isinstance(todos, (TodoTable, TodoIndex)):
+            return self.count(todos) > 0
+
+        return any(True for _ in filter(self.match if _stats is None else _stats._matcher(self._checks), todos))
+
+    def __call__(self, todos):
+        """Return the list of todos matching this query.
+
+        If a :class:`todotxtio.TodoTable` is given instead of a list, a :class:`todotxtio.TodoTable` is returned.
+
+        :param iterable todos: :class:`todotxtio.Todo` objects
+        :rtype: list
+        """
+        if _stats is not None:
+            return self._search(todos, False)
+
+        if isinstance(todos, (TodoTable, TodoIndex)):
+            return todos.search(*self.criteria)
+
+        return list(filter(self.match, todos))
+
+    def _search(self, todos, rows):
+        """Search todos while recording statistics (see :class:`todotxtio.Stats`)."""
+        stats = _stats
+        start = time.perf_counter()
+
+        if isinstance(todos, TodoTable):
+            results = todos._match(*self.criteria) if rows else todos.search(*self.criteria)
+            stats._count_search(len(todos), len(results), time.perf_counter() - start)
+        elif isinstance(todos, TodoIndex):
+            results = todos.search(*self.criteria)
+            stats._count_search(len(todos), len(results), time.perf_counter() - start)
+        else:
+            results = list(filter(stats._matcher(self._checks), todos))
+            stats.phases['search'] += time.perf_counter() - start
+
+        return results
+
+
+_missing = object()
+
+
+def _to_set(values):
+    """Convert search criteria values to a frozenset, or leave them as is if they aren't hashable."""
+    try:
+        return frozenset(values)
+    except TypeError:
+        return values
+
+
+def _intersects(values, todo_values):
+    if isinstance(values, frozenset):
+        return not values.isdisjoint(todo_values)
+
+    return any(value in values for value in todo_values)
+
+
+@lru_cache(maxsize=65536) # About 180 years of daily dates, so scanning multi-year archives doesn't evict them
+def _parse_date(string):
+    """Parse a ``YYYY-MM-DD`` date string, which is only done once per date as long as there are less distinct dates than
+    the cache can hold (dates are interned while parsing, see :func:`todotxtio.from_string`).
+
+    :rtype: datetime.date or None
+    """
+    if len(string) != 10 or string[4] != '-' or string[7] != '-' or not string.isascii():
+        return None
+
+    try:
+        return datetime.date.fromisoformat(string)
+    except ValueError:
+        return None
+
+
+def _date_value(value):
+    """Return the :class:`datetime.date` of a todo date, or ``None`` if it's not a valid ``YYYY-MM-DD`` date."""
+    return _parse_date(value) if type(value) is str else None
+
+
+def _to_date_range(name, date_range):
+    """Convert a ``(start, end)`` date range criteria to a pair of :class:`datetime.date` objects (or ``None``)."""
+    try:
+        start, end = date_range
+    except (TypeError, ValueError):
+        raise ValueError(name + ' should be a pair of dates')
+
+    bounds = []
+
+    for bound in (start, end):
+        if isinstance(bound, str):
+            bound = _parse_date(bound)
+
+            if bound is None:
+                raise ValueError(name + ' should be a pair of dates')
+        elif isinstance(bound, datetime.datetime):
+            bound = bound.date()
+        elif bound is not None and not isinstance(bound, datetime.date):
+            raise ValueError(name + ' should be a pair of dates')
+
+        bounds.append(bound)
+
+    return tuple(bounds)
+
+
+def _in_date_range(day, start, end):
+    return day is not None and (start is None or start <= day) and (end is None or day <= end)
+
+
+def sort_todos(todos, by=('priority', 'creation_date', 'text'), reverse=False):
+    """Return the todos sorted by the given fields.
+
+    Fields can be ``completed``, ``priority``, ``creation_date``, ``completion_date`` and ``text``. Todos without
+    priority or dates come last, after the ones with non-standard dates, in descending order as well. Todos comparing
+    equal keep their order.
+
+    The sort key of each todo is computed once, packing consecutive fields other than ``text`` in a single integer,
+    and todos are then sorted by each of these keys, the last one first. If a :class:`todotxtio.TodoTable` is given,
+    the keys are computed straight from its columns and a :class:`todotxtio.TodoTable` is returned.
+
+    :param iterable todos: :class:`todotxtio.Todo` objects
+    :param list by: Fields to sort by, the first one first
+    :param bool reverse: Whether to sort in descending order
+    :rtype: list
+    """
+    if not isinstance(todos, TodoTable):
+        todos = list(todos)
+
+    rows = list(range(len(todos)))
+
+    # Sorts are stable, so sorting by the least significant key first gives the same order as sorting by all of them
+    for keys in reversed(_sort_keys(todos, by, reverse)):
+        rows.sort(key=keys.__getitem__)
+
+    return todos.take(rows) if isinstance(todos, TodoTable) else list(map(todos.__getitem__, rows))
+
+
+def top_k(todos, k, by=('priority', 'creation_date', 'text'), reverse=False):
+    """Return the first ``k`` todos of the todo list sorted by the given fields, without sorting the whole list.
+
+    The result is the same as ``sort_todos(todos, by, reverse)[:k]``, but the ``k`` todos are selected using a heap.
+
+    :param iterable todos: :class:`todotxtio.Todo` objects
+    :param int k: Number of todos to return
+    :param list by: Fields to sort by, the first one first (see :func:`todotxtio.sort_todos`)
+    :param bool reverse: Whether to sort in descending order
+    :rtype: list
+    """
+    if not isinstance(todos, TodoTable):
+        todos = list(todos)
+
+    keys = _sort_keys(todos, by, reverse)
+    keys = keys[0] if len(keys) == 1 else list(zip(*keys))
+    rows = heapq.nsmallest(k, range(len(keys)), key=keys.__getitem__)
+
+    return todos.take(rows) if isinstance(todos, TodoTable) else list(map(todos.__getitem__, rows))
+
+
+def group_by(todos, key):
+    """Group todos by the values of one of their fields, in a single pass over them.
+
+    ``key`` is either ``projects``, ``contexts``, ``priority``, ``completed``, ``creation_date``, ``completion_date`` or
+    else the name of a tag. A todo having several projects (or contexts) is put in the group of each of them. Todos
+    without any value are grouped under ``None``.
+
+    :param iterable todos: :class:`todotxtio.Todo` objects
+    :param str key: The field to group todos by
+    :rtype: dict
+    """
+    get_values = _group_values(key)
+    groups = {}
+
+    for todo in todos:
+        for value in get_values(todo):
+            group = groups.get(value)
+
+            if group is None:
+                group = groups[value] = []
+
+            group.append(todo)
+
+    return groups
+
+
+def aggregate(todos, key):
+    """Compute statistics about groups of todos, in a single pass over them.
+
+    Todos are grouped like :func:`todotxtio.group_by` does, and each group is mapped to a dict holding the number of
+    todos (``count``), of completed ones (``completed``) and their ratio (``completed_ratio``), as well as the oldest
+    and newest creation and completion dates (``oldest_creation_date``, ``newest_creation_date``,
+    ``oldest_completion_date`` and ``newest_completion_date``, which are ``None`` if there's no valid date).
+
+    :param iterable todos: :class:`todotxtio.Todo` objects
+    :param str key: The field to group todos by
+    :rtype: dict
+    """
+    get_values = _group_values(key)
+    missing = _sort_date_codes[1] # Codes of non-standard or missing dates are at least this one
+    totals = {}
+
+    for todo in todos:
+        creation_code = _date_sort_code(todo.creation_date)
+        completion_code = _date_sort_code(todo._completion_date)
+
+        for value in get_values(todo):
+            total = totals.get(value)
+
+            if total is None:
+                total = totals[value] = [0, 0, missing, 0, missing, 0]
+
+            total[0] += 1
+
+            if todo._completed:
+                total[1] += 1
+
+            if creation_code < missing:
+                if creation_code < total[2]:
+                    total[2] = creation_code
+
+                if creation_code > total[3]:
+                    total[3] = creation_code
+
+            if completion_code < missing:
+                if completion_code < total[4]:
+                    total[4] = completion_code
+
+                if completion_code > total[5]:
+                    total[5] = completion_code
+
+    return {
+        value: {
+            'count': total[0],
+            'completed': total[1],
+            'completed_ratio': total[1] / total[0],
+            'oldest_creation_date': _decode_date(total[2], None) if total[3] else None,
+            'newest_creation_date': _decode_date(total[3], None) if total[3] else None,
+            'oldest_completion_date': _decode_date(total[4], None) if total[5] else None,
+            'newest_completion_date': _decode_date(total[5], None) if total[5] else None
+        } for value, total in totals.items()
+    }
+
+
+def _group_values(key):
+    """Return the function giving the values of a todo to group it by (see :func:`todotxtio.group_by`)."""
+    if key in ('projects', 'contexts'):
+        attribute = operator.attrgetter('_' + key)
+
+        def get_values(todo):
+            values = attribute(todo)
+
+            if not values:
+                return (None,)
+
+            return values if len(values) == 1 else dict.fromkeys(values) # A value listed twice is only counted once
+    elif key in ('priority', 'completed', 'creation_date', 'completion_date'):
+        attribute = operator.attrgetter(key if key in ('priority', 'creation_date') else '_' + key)
+
+        def get_values(todo):
+            return (attribute(todo),)
+    else:
+        def get_values(todo):
+            return (todo._tags.get(key) if todo._tags else None,)
+
+    return get_values
+
+
+_sort_radixes = {
+    'completed': 2,
+    'priority': 0x110001,
+    'creation_date': 100000002,
+    'completion_date': 100000002
+}
+
+
+def _sort_keys(todos, by, reverse=False):
+    """Return the lists of sort keys of the todos of a list or a table, the most significant one first.
+
+    Consecutive fields other than ``text`` are packed in a single list of integers, texts having their own list. Keys
+    always sort in ascending order: in descending order, they're reversed field by field (see
+    :func:`todotxtio._reverse_sort_codes`).
+
+    :rtype: list
+    """
+    if isinstance(by, str):
+        by = (by,)
+
+    groups = []
+    packed = None
+
+    for field in by:
+        if field not in _sort_radixes and field != 'text':
+            raise ValueError('by should only contain ' + ', '.join(list(_sort_radixes) + ['text']))
+
+        column = _sort_column(todos, field)
+
+        if reverse:
+            column = _reverse_sort_codes(field, column)
+
+        if field == 'text':
+            if packed is not None:
+                groups.append(packed)
+                packed = None
+
+            groups.append(column)
+        elif packed is None:
+            packed = column
+        else:
+            radix = _sort_radixes[field]
+            packed = [value * radix + code for value, code in zip(packed, column)]
+
+    if packed is not None:
+        groups.append(packed)
+
+    if not groups:
+        raise ValueError('by should contain at least one field')
+
+    return groups
+
+
+def _sort_column(todos, field):
+    """Return the sort codes of a field for each todo of a list or a table (see :func:`todotxtio._sort_keys`)."""
+    if isinstance(todos, TodoTable):
+        if field == 'completed':
+            return todos._completed
+        elif field == 'priority':
+            return list(map(_priority_sort_codes.__getitem__, todos._priorities))
+        elif field == 'text':
+            return [text if text is not None else '' for text in todos._texts]
+
+        column = todos._creation_dates if field == 'creation_date' else todos._completion_dates
+        codes = {code: _date_sort_code(_decode_date(code, None)) if code >= 0 else _sort_date_codes[1] for code in set(column)}
+
+        return list(map(codes.__getitem__, column))
+
+    if field == 'completed':
+        return list(map(operator.attrgetter('_completed'), todos))
+    elif field == 'priority':
+        return list(map(_priority_sort_code, map(operator.attrgetter('priority'), todos)))
+    elif field == 'text':
+        return [text if text is not None else '' for text in map(operator.attrgetter('text'), todos)]
+
+    return list(map(_date_sort_code, map(operator.attrgetter('creation_date' if field == 'creation_date' else '_completion_date'), todos)))
+
+
+def _reverse_sort_codes(field, column):
+    """Return the sort codes of a field giving the opposite order to the given ones, except for todos without the field
+    or with a non-standard value, which still come last."""
+    if field == 'text': # Texts are ranked, the last one first
+        ranks = {text: rank for rank, text in enumerate(sorted(set(column), reverse=True))}
+
+        return list(map(ranks.__getitem__, column))
+    elif field == 'completed':
+        return [0 if code else 1 for code in column]
+
+    special = 0x10FFFF if field == 'priority' else _sort_date_codes[1] # The lowest code which isn't a standard value
+
+    return [special - code if code < special else code for code in column]
+
+
+_priority_sort_codes = [0x110000] + list(range(1, 256)) # Todos without priority come last
+_sort_date_codes = (100000001, 100000000) # Todos without date come last, after the ones with non-standard dates
+
+
+@lru_cache(maxsize=4096)
+def _priority_sort_code(priority):
+    if priority is None:
+        return 0x110000
+
+    return ord(priority) if type(priority) is str and len(priority) == 1 else 0x10FFFF
+
+
+@lru_cache(maxsize=4096)
+def _date_sort_code(date):
+    if date is None:
+        return _sort_date_codes[0]
+    elif _date_value(date) is None: # Like 2020-99-99, which could otherwise be encoded
+        return _sort_date_codes[1]
+
+    return _encode_date(date, lambda value: None)
+
+
+class TodoTable:
+    """A todo list stored column by column instead of as a list of :class:`todotxtio.Todo` objects.
+
+    Completion states are stored as a byte per todo, priorities as the byte value of their character and dates as
+    ``YYYYMMDD`` integers. Projects, contexts and tag keys and values are interned in a symbol table shared by the
+    whole table and stored as ids, with an offset array pointing to the ids of each todo.
+
+    Iterating over a table or indexing it yields new :class:`todotxtio.Todo` objects: modifying them doesn't modify the
+    table. Priorities must be ``None`` or a single character.
+
+    :param iterable todos: :class:`todotxtio.Todo` objects to fill the table with
+    """
+    def __init__(self, todos=None):
+        self._texts = []
+        self._completed = bytearray()
+        self._priorities = bytearray()
+        self._completion_dates = array('l')
+        self._creation_dates = array('l')
+        self._project_ids = array('l')
+        self._project_offsets = array('l', [0])
+        self._context_ids = array('l')
+        self._context_offsets = array('l', [0])
+        self._tag_key_ids = array('l')
+        self._tag_value_ids = array('l')
+        self._tag_offsets = array('l', [0])
+        self._symbols = []
+        self._symbol_ids = {}
+        self._owners = {}
+
+        if todos is not None:
+            self.extend(todos)
+
+    @classmethod
+    def from_todos(cls, todos):
+        """Build a table from a list of :class:`todotxtio.Todo` objects.
+
+        :param list todos: List of :class:`todotxtio.Todo` objects
+        :rtype: todotxtio.TodoTable
+        """
+        return cls(todos)
+
+    @classmethod
+    def from_dicts(cls, todos):
+        """Build a table from a list of todo dicts.
+
+        :param list todos: A list of todo dicts
+        :rtype: todotxtio.TodoTable
+        """
+        table = cls()
+
+        for todo in todos:
+            table.append(Todo(**todo))
+
+        return table
+
+    @classmethod
+    def from_string(cls, string):
+        """Parse a todo list from a string straight into a table, without creating :class:`todotxtio.Todo` objects.
+
+        :param str string: The string to parse
+        :rtype: todotxtio.TodoTable
+        """
+        return cls._from_lines(_iter_lines(_split_string(string)))
+
+    @classmethod
+    def from_stream(cls, stream, close=True):
+        """Parse a todo list from an already-opened stream straight into a table.
+
+        :param file stream: A file-like object
+        :param bool close: Whetever to close the stream or not after all operation are finised
+        :rtype: todotxtio.TodoTable
+        """
+        try:
+            return cls._from_lines(_iter_lines(stream))
+        finally:
+            if close:
+                stream.close()
+
+    @classmethod
+    def from_file(cls, file_path, encoding='utf-8', memory_map=False):
+        """Parse a todo list from a file straight into a table.
+
+        :param str file_path: Path to the file
+        :param str encoding: The encoding of the file to open
+        :param bool memory_map: Whether to map the file in memory instead of reading it (see :func:`todotxtio.iter_file`)
+        :rtype: todotxtio.TodoTable
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError('File doesn\'t exists: ' + file_path)
+
+        if memory_map and '\n'.encode(encoding) == b'\n':
+            return cls._from_lines(_iter_lines(_iter_mapped_file(file_path, encoding)))
+
+        stream = open(file_path, 'r', encoding=encoding)
+
+        return cls.from_stream(stream)
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path, file_path=None, encoding='utf-8', check_hash=False, update=True):
+        """Load a table from a binary snapshot (see :func:`todotxtio.from_snapshot`).
+
+        :param str snapshot_path: Path to the snapshot
+        :param str file_path: Path to the todo file the snapshot was made from
+        :param str encoding: The encoding of the todo file
+        :param bool check_hash: Whether to also check the hash of the todo file content
+        :param bool update: Whether to write the snapshot again when it's stale
+        :rtype: todotxtio.TodoTable
+        """
+        return _load_snapshot(snapshot_path, file_path, encoding, check_hash, update)
+
+    @classmethod
+    def _from_lines(cls, lines):
+        table = cls()
+
+        for line in lines:
+            table._append_fields(*_parse_fields(line))
+
+        return table
+
+    def to_todos(self):
+        """Convert this table to a list of :class:`todotxtio.Todo` objects.
+
+        :rtype: list
+        """
+        symbols = self._symbols
+        priorities = [None] + [chr(value) for value in range(1, 256)]
+        completion_dates = {code: _decode_date(code, symbols) for code in set(self._completion_dates)}
+        creation_dates = {code: _decode_date(code, symbols) for code in set(self._creation_dates)}
+
+        # Each column is decoded at once, instead of row by row
+        return list(map(
+            Todo,
+            self._texts,
+            map(bool, self._completed),
+            map(completion_dates.__getitem__, self._completion_dates),
+            map(priorities.__getitem__, self._priorities),
+            map(creation_dates.__getitem__, self._creation_dates),
+            _split_values(list(map(symbols.__getitem__, self._project_ids)), self._project_offsets),
+            _split_values(list(map(symbols.__getitem__, self._context_ids)), self._context_offsets),
+            map(
+                lambda keys, values: dict(zip(keys, values)) if keys else None,
+                _split_values(list(map(symbols.__getitem__, self._tag_key_ids)), self._tag_offsets),
+                _split_values(list(map(symbols.__getitem__, self._tag_value_ids)), self._tag_offsets)
+            )
+        ))
+
+    def to_dicts(self):
+        """Convert this table to a list of todo dicts.
+
+        :rtype: list
+        """
+        return [todo.to_dict() for todo in self]
+
+    def append(self, todo):
+        """Add a todo at the end of this table.
+
+        :param todotxtio.Todo todo: The todo to add
+        """
+        self._append_fields(todo.text, todo._completed, todo._completion_date, todo.priority, todo.creation_date, todo._projects, todo._contexts, todo._tags)
+
+    def extend(self, todos):
+        """Add todos at the end of this table.
+
+        :param iterable todos: :class:`todotxtio.Todo` objects to add
+        """
+        for todo in todos:
+            self.append(todo)
+
+    def _append_fields(self, text, completed, completion_date, priority, creation_date, projects, contexts, tags):
+        intern = self._intern
+
+        self._texts.append(text)
+        self._completed.append(1 if completed else 0)
+        self._priorities.append(_encode_priority(priority))
+        self._completion_dates.append(_encode_date(completion_date, intern))
+        self._creation_dates.append(_encode_date(creation_date, intern))
+
+        if projects:
+            self._project_ids.extend(map(intern, projects))
+
+        self._project_offsets.append(len(self._project_ids))
+
+        if contexts:
+            self._context_ids.extend(map(intern, contexts))
+
+        self._context_offsets.append(len(self._context_ids))
+
+        if tags:
+            for tag_name, tag_value in tags.items():
+                self._tag_key_ids.append(intern(tag_name))
+                self._tag_value_ids.append(intern(tag_value))
+
+        self._tag_offsets.append(len(self._tag_key_ids))
+
+        if self._owners:
+            self._owners = {}
+
+    def _intern(self, string):
+        """Return the id of a string in the symbol table of this table, adding it if needed."""
+        symbol_id = self._symbol_ids.get(string)
+
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[string] = len(self._symbols)
+            self._symbols.append(string)
+
+        return symbol_id
+
+    def _row_fields(self, row):
+        """Return the values of a row, in the :class:`todotxtio.Todo` constructor arguments order."""
+        symbols = self._symbols
+        start, end = self._project_offsets[row], self._project_offsets[row + 1]
+        projects = [symbols[i] for i in self._project_ids[start:end]] if end > start else None
+        start, end = self._context_offsets[row], self._context_offsets[row + 1]
+        contexts = [symbols[i] for i in self._context_ids[start:end]] if end > start else None
+        start, end = self._tag_offsets[row], self._tag_offsets[row + 1]
+        tags = {symbols[k]: symbols[v] for k, v in zip(self._tag_key_ids[start:end], self._tag_value_ids[start:end])} if end > start else None
+        priority = self._priorities[row]
+
+        return (
+            self._texts[row],
+            self._completed[row] == 1,
+            _decode_date(self._completion_dates[row], symbols),
+            chr(priority) if priority else None,
+            _decode_date(self._creation_dates[row], symbols),
+            projects,
+            contexts,
+            tags
+        )
+
+    def take(self, rows):
+        """Return a new table made of the given rows of this one.
+
+        :param iterable rows: Indexes of the rows to take
+        :rtype: todotxtio.TodoTable
+        """
+        table = TodoTable()
+        table._symbols = self._symbols # The symbol table only grows, it can be safely shared
+        table._symbol_ids = self._symbol_ids
+
+        for row in rows:
+            table._texts.append(self._texts[row])
+            table._completed.append(self._completed[row])
+            table._priorities.append(self._priorities[row])
+            table._completion_dates.append(self._completion_dates[row])
+            table._creation_dates.append(self._creation_dates[row])
+            table._project_ids.extend(self._project_ids[self._project_offsets[row]:self._project_offsets[row + 1]])
+            table._project_offsets.append(len(table._project_ids))
+            table._context_ids.extend(self._context_ids[self._context_offsets[row]:self._context_offsets[row + 1]])
+            table._context_offsets.append(len(table._context_ids))
+            table._tag_key_ids.extend(self._tag_key_ids[self._tag_offsets[row]:self._tag_offsets[row + 1]])
+            table._tag_value_ids.extend(self._tag_value_ids[self._tag_offsets[row]:self._tag_offsets[row + 1]])
+            table._tag_offsets.append(len(table._tag_key_ids))
+
+        return table
+
+    def search(self, text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None, creation_date_range=None, completion_date_range=None):
+        """Return a new table made of the todos matching the provided filters.
+
+        Takes the same criteria as :func:`todotxtio.search`, but each of them is evaluated over a whole column at once.
+
+        :rtype: todotxtio.TodoTable
+        """
+        return self.take(self._match(text, completed, completion_date, priority, creation_date, projects, contexts, tags, creation_date_range, completion_date_range))
+
+    def _match(self, text, completed, completion_date, priority, creation_date, projects, contexts, tags, creation_date_range, completion_date_range):
+        """Return the indexes of the rows matching the provided filters."""
+        size = len(self._texts)
+        masks = []
+
+        if text is not None:
+            masks.append(bytes(map(operator.contains, self._texts, repeat(text))))
+
+        if completed is not None:
+            if completed == True:
+                masks.append(self._completed)
+            elif completed == False:
+                masks.append(self._completed.translate(_invert_table))
+            else:
+                return []
+
+        if completion_date is not None:
+            masks.append(self._date_mask(self._completion_dates, completion_date))
+
+        if priority is not None:
+            masks.append(self._priorities.translate(_priority_table(priority)))
+
+        if creation_date is not None:
+            masks.append(self._date_mask(self._creation_dates, creation_date))
+
+        if completion_date_range is not None:
+            masks.append(self._date_range_mask(self._completion_dates, *_to_date_range('completion_date_range', completion_date_range)))
+
+        if creation_date_range is not None:
+            masks.append(self._date_range_mask(self._creation_dates, *_to_date_range('creation_date_range', creation_date_range)))
+
+        if projects is not None:
+            wanted = {self._symbol_ids[project] for project in projects if project in self._symbol_ids}
+            masks.append(self._values_mask('projects', self._project_offsets, map(wanted.__contains__, self._project_ids)))
+
+        if contexts is not None:
+            wanted = {self._symbol_ids[context] for context in contexts if context in self._symbol_ids}
+            masks.append(self._values_mask('contexts', self._context_offsets, map(wanted.__contains__, self._context_ids)))
+
+        if tags is not None:
+            wanted = {
+                (self._symbol_ids[tag_name], self._symbol_ids[tag_value]) for tag_name, tag_value in tags.items()
+                if tag_name in self._symbol_ids and _is_hashable(tag_value) and tag_value in self._symbol_ids
+            }
+            masks.append(self._values_mask('tags', self._tag_offsets, map(wanted.__contains__, zip(self._tag_key_ids, self._tag_value_ids))))
+
+        if not masks:
+            return range(size)
+
+        mask = int.from_bytes(masks[0], 'little')
+
+        for other_mask in masks[1:]:
+            mask &= int.from_bytes(other_mask, 'little')
+
+        return list(compress(range(size), mask.to_bytes(size, 'little')))
+
+    def _date_mask(self, column, date):
+        code = _encode_date(date, self._symbol_ids.get)
+
+        if code is None: # Not a date known by this table
+            return bytes(len(column))
+
+        return bytes(map(code.__eq__, column))
+
+    def _date_range_mask(self, column, start, end):
+        # Dates are checked once per distinct value of the column, not once per row
+        symbols = self._symbols
+        matches = {code: _in_date_range(_date_value(_decode_date(code, symbols)), start, end) for code in set(column)}
+
+        return bytes(map(matches.__getitem__, column))
+
+    def _values_mask(self, name, offsets, flags):
+        """Return the mask of the rows having at least one of their multi-valued column value flagged."""
+        mask = bytearray(len(offsets) - 1)
+        owners = self._owners.get(name)
+
+        if owners is None: # Row of each value, computed once until the table is modified
+            owners = array('l')
+
+            for row in range(len(offsets) - 1):
+                owners.extend(repeat(row, offsets[row + 1] - offsets[row]))
+
+            self._owners[name] = owners
+
+        for row in compress(owners, flags):
+            mask[row] = 1
+
+        return mask
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __iter__(self):
+        for row in range(len(self._texts)):
+            yield Todo(*self._row_fields(row))
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return self.take(range(*row.indices(len(self._texts))))
+
+        if row < 0:
+            row += len(self._texts)
+
+        if not 0 <= row < len(self._texts):
+            raise IndexError('TodoTable index out of range')
+
+        return Todo(*self._row_fields(row))
+
+    def __repr__(self):
+        return '<TodoTable: ' + str(len(self._texts)) + ' todos>'
+
+
+def _split_values(values, offsets):
+    """Yield the slice of values of each row of a multi-valued column, or ``None`` for rows without values."""
+    for start, end in zip(offsets, islice(offsets, 1, None)):
+        yield values[start:end] if end > start else None
+
+
+_invert_table = bytes([1, 0]) + bytes(254)
+
+
+def _priority_table(priority):
+    """Return the translation table mapping a priority byte to 1 if it's in the given priorities, 0 otherwise."""
+    table = bytearray(256)
+
+    for value in range(256):
+        try:
+            table[value] = (chr(value) if value else None) in priority
+        except TypeError: # For instance when checking None against a string of priorities
+            pass
+
+    return bytes(table)
+
+
+def _encode_priority(priority):
+    if not priority:
+        return 0
+
+    if type(priority) is not str or len(priority) != 1 or not 0 < ord(priority) < 256:
+        raise ValueError('priority should be a single character')
+
+    return ord(priority)
+
+
+def _encode_date(date, intern):
+    """Encode a ``YYYY-MM-DD`` date to a ``YYYYMMDD`` integer.
+
+    ``None`` is encoded to 0. Values which can't be encoded that way are stored in a symbol table thanks to the given
+    ``intern`` callable returning their id (or ``None`` if it's unknown), and are encoded to negative integers.
+
+    :rtype: int
+    """
+    if date is None:
+        return 0
+
+    if type(date) is str and len(date) == 10 and date[4] == '-' and date[7] == '-' and date.isascii():
+        digits = date[:4] + date[5:7] + date[8:]
+
+        if digits.isdigit() and digits != '00000000':
+            return int(digits)
+
+    symbol_id = intern(date)
+
+    return None if symbol_id is None else -symbol_id - 1
+
+
+def _decode_date(code, symbols):
+    if code > 0:
+        return '{:04d}-{:02d}-{:02d}'.format(code // 10000, code // 100 % 100, code % 100)
+    elif code < 0:
+        return symbols[-code - 1]
+
+    return None
+
+
+def _is_hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+
+    return True
+
+
+_snapshot_header = struct.Struct('<8sBqqq20s') # Magic, version, number of todos, file size, file mtime and hash
+_snapshot_magic = b'TODOSNAP'
+_snapshot_version = 1
+
+
+def _load_snapshot(snapshot_path, file_path, encoding, check_hash, update):
+    """Load a table from a snapshot if it's fresh, or from its todo file otherwise (see :func:`todotxtio.from_snapshot`).
+
+    :rtype: todotxtio.TodoTable
+    """
+    if file_path is None:
+        if not os.path.isfile(snapshot_path):
+            raise FileNotFoundError('File doesn\'t exists: ' + snapshot_path)
+
+        return _read_snapshot(snapshot_path)
+
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError('File doesn\'t exists: ' + file_path)
+
+    stat = os.stat(file_path)
+    content = digest = None
+
+    if check_hash:
+        with open(file_path, 'rb') as stream:
+            content = stream.read()
+
+        digest = hashlib.sha1(content).digest()
+
+    try:
+        return _read_snapshot(snapshot_path, (stat.st_size, stat.st_mtime_ns), digest)
+    except (OSError, ValueError): # Missing, unreadable or stale snapshot
+        pass
+
+    if content is None:
+        with open(file_path, 'rb') as stream:
+            content = stream.read()
+
+    table = TodoTable._from_lines(_iter_lines(_split_string(content.decode(encoding))))
+
+    if update:
+        try:
+            # The file is stat'ed before being read, so a file modified in between gives a snapshot considered stale
+            _write_snapshot(snapshot_path, table, (stat.st_size, stat.st_mtime_ns, hashlib.sha1(content).digest()))
+        except OSError: # Missing or read-only directory: the todo file has been parsed anyway
+            pass
+
+    return table
+
+
+def _write_snapshot(snapshot_path, table, signature):
+    """Write the columns of a table to a snapshot file, along with the signature of its todo file."""
+    columns = (
+        _pack_strings(table._texts),
+        bytes(table._completed),
+        bytes(table._priorities),
+        _pack_ints(table._completion_dates),
+        _pack_ints(table._creation_dates),
+        _pack_ints(table._project_ids),
+        _pack_ints(table._project_offsets),
+        _pack_ints(table._context_ids),
+        _pack_ints(table._context_offsets),
+        _pack_ints(table._tag_key_ids),
+        _pack_ints(table._tag_value_ids),
+        _pack_ints(table._tag_offsets),
+        _pack_strings(table._symbols)
+    )
+
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as stream:
+            stream.write(_snapshot_header.pack(_snapshot_magic, _snapshot_version, len(table), *signature))
+
+            for column in columns:
+                stream.write(struct.pack('<q', len(column)))
+                stream.write(column)
+
+        os.replace(temp_path, snapshot_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        raise
+
+
+def _read_snapshot(snapshot_path, stat=None, digest=None):
+    """Read a table from a snapshot file.
+
+    A ``ValueError`` is raised if the snapshot is invalid, or if ``stat`` (the size and modification time of the todo
+    file) or ``digest`` (the hash of its content) is given and isn't the one recorded in the snapshot.
+
+    :rtype: todotxtio.TodoTable
+    """
+    with open(snapshot_path, 'rb') as stream:
+        header = stream.read(_snapshot_header.size)
+
+        if len(header) != _snapshot_header.size:
+            raise ValueError('Invalid snapshot: ' + snapshot_path)
+
+        magic, version, size, file_size, file_mtime, file_digest = _snapshot_header.unpack(header)
+
+        if magic != _snapshot_magic or version != _snapshot_version:
+            raise ValueError('Invalid snapshot: ' + snapshot_path)
+
+        if (stat is not None and stat != (file_size, file_mtime)) or (digest is not None and digest != file_digest):
+            raise ValueError('Stale snapshot: ' + snapshot_path)
+
+        data = stream.read()
+
+    columns = []
+    offset = 0
+
+    try:
+        while offset < len(data):
+            length = struct.unpack_from('<q', data, offset)[0]
+            offset += 8
+            columns.append(data[offset:offset + length])
+            offset += length
+
+        if len(columns) != 13 or offset != len(data):
+            raise ValueError('Invalid snapshot: ' + snapshot_path)
+
+        texts = _unpack_strings(columns[0])
+        symbols = _unpack_strings(columns[12])
+    except (struct.error, IndexError):
+        raise ValueError('Invalid snapshot: ' + snapshot_path)
+
+    table = TodoTable()
+    table._texts = texts
+    table._completed = bytearray(columns[1])
+    table._priorities = bytearray(columns[2])
+    table._completion_dates = _unpack_ints(columns[3])
+    table._creation_dates = _unpack_ints(columns[4])
+    table._project_ids = _unpack_ints(columns[5])
+    table._project_offsets = _unpack_ints(columns[6])
+    table._context_ids = _unpack_ints(columns[7])
+    table._context_offsets = _unpack_ints(columns[8])
+    table._tag_key_ids = _unpack_ints(columns[9])
+    table._tag_value_ids = _unpack_ints(columns[10])
+    table._tag_offsets = _unpack_ints(columns[11])
+    table._symbols = symbols
+    table._symbol_ids = {symbol: symbol_id for symbol_id, symbol in enumerate(table._symbols)}
+
+    if len(table) != size:
+        raise ValueError('Invalid snapshot: ' + snapshot_path)
+
+    return table
+
+
+def _pack_ints(column):
+    """Encode an array of integers to little-endian 32 bits integers."""
+    column = array('i', column)
+
+    if sys.byteorder == 'big':
+        column.byteswap()
+
+    return column.tobytes()
+
+
+def _unpack_ints(data):
+    """Decode little-endian 32 bits integers to an ``array('l')``."""
+    column = array('i')
+    column.frombytes(data)
+
+    if sys.byteorder == 'big':
+        column.byteswap()
+
+    return array('l', column)
+
+
+def _pack_strings(strings):
+    """Encode a list of strings (or ``None``) to the offsets of each string in their concatenation, the positions of
+    the ``None`` values and the concatenation itself."""
+    nones = [position for position, string in enumerate(strings) if string is None]
+
+    if nones:
+        strings = ['' if string is None else string for string in strings]
+
+    try:
+        blob = ''.join(strings).encode('utf-8', 'surrogatepass')
+    except TypeError:
+        raise ValueError('snapshot values should be strings')
+
+    offsets = array('l', [0])
+    offsets.extend(accumulate(map(len, strings)))
+
+    return struct.pack('<qq', len(offsets), len(nones)) + _pack_ints(offsets) + _pack_ints(nones) + blob
+
+
+def _unpack_strings(data):
+    """Decode a list of strings encoded by :func:`todotxtio._pack_strings`."""
+    count, nones_count = struct.unpack_from('<qq', data)
+    start = 16 + count * 4
+    end = start + nones_count * 4
+    offsets = _unpack_ints(data[16:start])
+    text = data[end:].decode('utf-8', 'surrogatepass')
+    strings = [text[string_start:string_end] for string_start, string_end in zip(offsets, islice(offsets, 1, None))]
+
+    for position in _unpack_ints(data[start:end]):
+        strings[position] = None
+
+    return strings
+
+
+class TodoIndex:
+    """A todo list indexed by completion state, dates, priority, projects, contexts and tags.
+
+    Each of these values is mapped to the set of positions of the todos having it, so :meth:`todotxtio.TodoIndex.search`
+    only has to intersect a few sets instead of checking every todo. The index must be told about todos being added,
+    removed or modified, using the methods below.
+
+    With ``text_index`` set, the substrings of one, two and three characters of the todos text are indexed as well, so
+    text searches only check the todos having the searched text itself if it's shorter than three characters, or all
+    its trigrams otherwise. This takes a lot more memory.
+
+    :param iterable todos: :class:`todotxtio.Todo` objects to index
+    :param bool text_index: Whether to index the todos text
+    """
+    def __init__(self, todos=None, text_index=False):
+        self._text_index = text_index
+        self._clear()
+
+        if todos is not None:
+            self.extend(todos)
+
+    def _clear(self):
+        self._todos = [] # Removed todos leave a None hole so the positions of the others doesn't change
+        self._keys = []
+        self._positions = {}
+        self._postings = {}
+        self._removed = 0
+        self._sorted_dates = {} # Distinct dates of each date key, sorted, built when needed
+        self._texts = [] # Indexed text of each todo, to unindex it once the todo has been modified
+        self._grams = {}
+
+    def add(self, todo):
+        """Add a todo to this index.
+
+        A ``ValueError`` is raised if the todo is already in the index.
+
+        :param todotxtio.Todo todo: The todo to add
+        """
+        if id(todo) in self._positions:
+            raise ValueError('Todo is already in the index: ' + repr(todo))
+
+        position = len(self._todos)
+
+        self._todos.append(todo)
+        self._keys.append(None)
+        self._texts.append(None)
+        self._positions[id(todo)] = position
+        self._index(position)
+
+    def extend(self, todos):
+        """Add todos to this index.
+
+        A ``ValueError`` is raised if one of the todos is already in the index.
+
+        :param iterable todos: :class:`todotxtio.Todo` objects to add
+        """
+        with _gc_paused(): # Indexing creates lots of sets, which would trigger lots of useless collections
+            for todo in todos:
+                self.add(todo)
+
+    def remove(self, todo):
+        """Remove a todo from this index.
+
+        :param todotxtio.Todo todo: The todo to remove
+        """
+        position = self._position(todo)
+
+        self._unindex(position)
+        self._todos[position] = None
+        self._keys[position] = None
+        self._texts[position] = None
+        del self._positions[id(todo)]
+        self._removed += 1
+
+        if self._removed > len(self._todos) // 2: # Get rid of the holes once they're the majority
+            todos = list(self)
+
+            self._clear()
+            self.extend(todos)
+
+    def update(self, todo):
+        """Update the index of a todo after it was modified.
+
+        :param todotxtio.Todo todo: The modified todo
+        """
+        position = self._position(todo)
+
+        self._unindex(position)
+        self._index(position)
+
+    def search(self, text=None, completed=None, completion_date=None, priority=None, creation_date=None, projects=None, contexts=None, tags=None, creation_date_range=None, completion_date_range=None):
+        """Return a list of the indexed todos that matches the provided filters, in the order they were added.
+
+        Takes the same criteria as :func:`todotxtio.search`.
+
+        :rtype: list
+        """
+        candidates = []
+
+        if completed is not None:
+            candidates.append(self._postings.get(('completed', completed), ()))
+
+        if completion_date is not None:
+            candidates.append(self._postings.get(('completion_date', completion_date), ()))
+
+        if priority is not None:
+            candidates.append(self._union('priority', priority))
+
+        if creation_date is not None:
+            candidates.append(self._postings.get(('creation_date', creation_date), ()))
+
+        if projects is not None:
+            candidates.append(self._union('project', projects))
+
+        if contexts is not None:
+            candidates.append(self._union('context', contexts))
+
+        if tags is not None:
+            candidates.append(self._union('tag', [tag for tag in tags.items() if _is_hashable(tag[1])]))
+
+        if completion_date_range is not None:
+            candidates.append(self._date_range('completion_date', *_to_date_range('completion_date_range', completion_date_range)))
+
+        if creation_date_range is not None:
+            candidates.append(self._date_range('creation_date', *_to_date_range('creation_date_range', creation_date_range)))
+
+        if text and self._text_index:
+            candidates.extend(self._grams.get(gram, ()) for gram in (_grams(text, (3,)) if len(text) >= 3 else (text,)))
+
+        if candidates:
+            candidates.sort(key=len) # Starting with the most selective criteria keeps intermediate sets small
+
+            positions = set(candidates[0])
+
+            for other_positions in candidates[1:]:
+                positions.intersection_update(other_positions)
+
+            positions = sorted(positions)
+        else:
+            positions = [position for position, todo in enumerate(self._todos) if todo is not None]
+
+        results = [self._todos[position] for position in positions]
+
+        if text is not None:
+            results = [todo for todo in results if text in todo.text]
+
+        return results
+
+    def _union(self, name, values):
+        """Return the positions of the todos having at least one of the given values."""
+        positions = set()
+
+        for value in values:
+            positions.update(self._postings.get((name, value), ()))
+
+        return positions
+
+    def _date_range(self, name, start, end):
+        """Return the positions of the todos having a date between the given ones, found by bisecting the sorted
+        distinct dates of the given key."""
+        sorted_dates = self._sorted_dates.get(name)
+
+        if sorted_dates is None:
+            dates = sorted((_date_value(value), value) for key_name, value in self._postings if key_name == name and _date_value(value) is not None)
+            sorted_dates = self._sorted_dates[name] = ([day for day, value in dates], [value for day, value in dates])
+
+        days, values = sorted_dates
+        low = 0 if start is None else bisect.bisect_left(days, start)
+        high = len(days) if end is None else bisect.bisect_right(days, end)
+
+        return self._union(name, values[low:high])
+
+    def _position(self, todo):
+        position = self._positions.get(id(todo))
+
+        if position is None:
+            raise ValueError('Todo is not in the index: ' + repr(todo))
+
+        return position
+
+    def _index(self, position):
+        todo = self._todos[position]
+        keys = [
+            ('completed', todo._completed),
+            ('completion_date', todo._completion_date),
+            ('priority', todo.priority),
+            ('creation_date', todo.creation_date)
+        ]
+
+        if todo._projects:
+            keys.extend(('project', project) for project in todo._projects)
+
+        if todo._contexts:
+            keys.extend(('context', context) for context in todo._contexts)
+
+        if todo._tags:
+            keys.extend(('tag', tag) for tag in todo._tags.items() if _is_hashable(tag[1]))
+
+        for key in keys:
+            positions = self._postings.get(key)
+
+            if positions is None:
+                positions = self._postings[key] = set()
+
+                if key[0] in self._sorted_dates:
+                    del self._sorted_dates[key[0]]
+
+            positions.add(position)
+
+        self._keys[position] = keys
+
+        if self._text_index and todo.text:
+            grams = self._grams
+            self._texts[position] = todo.text
+
+            for gram in _grams(todo.text):
+                positions = grams.get(gram)
+
+                if positions is None:
+                    grams[gram] = {position}
+                else:
+                    positions.add(position)
+
+    def _unindex(self, position):
+        for key in self._keys[position]:
+            positions = self._postings[key]
+            positions.discard(position)
+
+            if not positions:
+                del self._postings[key]
+
+                if key[0] in self._sorted_dates:
+                    del self._sorted_dates[key[0]]
+
+        if self._texts[position]:
+            for gram in _grams(self._texts[position]):
+                positions = self._grams[gram]
+                positions.discard(position)
+
+                if not positions:
+                    del self._grams[gram]
+
+            self._texts[position] = None
+
+    def __len__(self):
+        return len(self._todos) - self._removed
+
+    def __iter__(self):
+        return (todo for todo in self._todos if todo is not None)
+
+    def __contains__(self, todo):
+        return id(todo) in self._positions
+
+    def __repr__(self):
+        return '<TodoIndex: ' + str(len(self)) + ' todos>'
+
+
+def _grams(text, sizes=(1, 2, 3)):
+    """Return the distinct substrings of the given sizes of a text.
+
+    :param str text: A text
+    :param tuple sizes: Sizes of the substrings
+    :rtype: set
+    """
+    return {text[i:i + size] for size in sizes for i in range(len(text) - size + 1)}
+
+
+class TodoFile:
+    """A todo file which can be modified todo by todo, without rewriting it entirely each time.
+
+    The byte offsets of the todo lines are recorded when the file is loaded, so appending todos only writes the new
+    lines at the end of the file, and updating a todo only overwrites its line if the new one has the same length. Any
+    other modification rewrites the file to a temporary file, which then atomically replaces the original one.
+
+    An error is raised if the file has been modified by someone else since it was last loaded or written.
+
+    :param str file_path: Path to the file
+    :param str encoding: The encoding of the file
+    """
+    def __init__(self, file_path, encoding='utf-8'):
+        self.file_path = file_path
+        self.encoding = encoding
+        self.todos = None
+        self._spans = None
+        self._newline = os.linesep.encode(encoding)
+        self._stat = None
+
+    def load(self):
+        """(Re)load the todos from the file.
+
+        :rtype: list
+        """
+        if not os.path.isfile(self.file_path):
+            raise FileNotFoundError('File doesn\'t exists: ' + self.file_path)
+
+        if '\n'.encode(self.encoding) != b'\n': # Offsets can't be tracked, this file will always be fully rewritten
+            self.todos = from_file(self.file_path, encoding=self.encoding)
+            self._spans = None
+            self._stat = self._current_stat()
+
+            return self.todos
+
+        lines = []
+        spans = []
+        offset = 0
+        exact = True
+
+        with open(self.file_path, 'rb') as stream:
+            for raw_line in stream:
+                line = raw_line.decode(self.encoding)
+
+                if offset == 0 and raw_line.endswith(b'\r\n'):
+                    self._newline = b'\r\n'
+                elif offset == 0 and raw_line.endswith(b'\n'):
+                    self._newline = b'\n'
+
+                if len(line.splitlines()) > 1: # Uncommon line breaks: a line of the file would contain several todos
+                    exact = False
+
+                lines.append(line)
+                spans.append((offset, offset + len(raw_line.rstrip(b'\r\n'))))
+
+                offset += len(raw_line)
+
+        self._stat = self._current_stat()
+
+        if not exact:
+            self.todos = [_parse_line(line) for line in _iter_lines(lines)]
+            self._spans = None
+
+            return self.todos
+
+        self.todos = []
+        self._spans = []
+        blanks = []
+
+        for line, span in zip(lines, spans):
+            line = line.strip()
+
+            if not line:
+                if self.todos: # Blank lines are only todos when they're followed by non-blank ones
+                    blanks.append(span)
+
+                continue
+
+            for blank_span in blanks:
+                self.todos.append(_parse_line(''))
+                self._spans.append(blank_span)
+
+            blanks = []
+
+            self.todos.append(_parse_line(line))
+            self._spans.append(span)
+
+        return self.todos
+
+    def append(self, todos):
+        """Add todos at the end of the file.
+
+        :param list todos: List of :class:`todotxtio.Todo` objects
+        """
+        todos = list(todos)
+
+        self._check()
+
+        if self._spans is None:
+            return self.rewrite(self.todos + todos)
+
+        lines = [str(todo).encode(self.encoding) for todo in todos]
+
+        if not lines:
+            return
+
+        # Trailing blank lines are dropped so they don't become blank todos
+        offset = self._spans[-1][1] if self._spans else 0
+
+        with open(self.file_path, 'r+b') as stream:
+            stream.seek(offset)
+            stream.truncate()
+
+            if self._spans:
+                stream.write(self._newline)
+                offset += len(self._newline)
+
+            stream.write(self._newline.join(lines))
+
+        for line in lines:
+            self._spans.append((offset, offset + len(line)))
+
+            offset += len(line) + len(self._newline)
+
+        self.todos.extend(todos)
+        self._stat = self._current_stat()
+
+    def update(self, index, todo):
+        """Replace the todo at the given index.
+
+        :param int index: Index of the todo to replace
+        :param todotxtio.Todo todo: The new todo
+        """
+        self._check()
+
+        index = range(len(self.todos))[index] # Also raises IndexError if needed
+
+        if self._spans is None:
+            return self.rewrite(self.todos[:index] + [todo] + self.todos[index + 1:])
+
+        line = str(todo).encode(self.encoding)
+        start, end = self._spans[index]
+        last = index == len(self.todos) - 1
+
+        if len(line) != end - start and not last:
+            return self.rewrite(self.todos[:index] + [todo] + self.todos[index + 1:])
+
+        with open(self.file_path, 'r+b') as stream:
+            stream.seek(start)
+            stream.write(line)
+
+            if last:
+                stream.truncate()
+
+        self.todos[index] = todo
+        self._spans[index] = (start, start + len(line))
+        self._stat = self._current_stat()
+
+    def remove(self, index):
+        """Remove the todo at the given index.
+
+        :param int index: Index of the todo to remove
+        """
+        self._check()
+
+        index = range(len(self.todos))[index]
+
+        if self._spans is None or index != len(self.todos) - 1:
+            return self.rewrite(self.todos[:index] + self.todos[index + 1:])
+
+        with open(self.file_path, 'r+b') as stream: # Removing the last todo is only a matter of truncating the file
+            stream.truncate(self._spans[index - 1][1] if index > 0 else 0)
+
+        del self.todos[index]
+        del self._spans[index]
+        self._stat = self._current_stat()
+
+    def rewrite(self, todos):
+        """Replace all the todos of the file.
+
+        The new content is written to a temporary file in the same directory, which then replaces the original one.
+
+        :param list todos: List of :class:`todotxtio.Todo` objects
+        """
+        todos = list(todos)
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                if '\n'.encode(self.encoding) == b'\n':
+                    lines = [str(todo).encode(self.encoding) for todo in todos]
+                    spans = []
+                    offset = 0
+
+                    for line in lines:
+                        spans.append((offset, offset + len(line)))
+
+                        offset += len(line) + len(self._newline)
+
+                    stream.write(self._newline.join(lines))
+                else:
+                    spans = None
+
+                    stream.write(to_string(todos).encode(self.encoding))
+
+                stream.flush()
+                os.fsync(stream.fileno())
+
+            if os.path.exists(self.file_path):
+                shutil.copymode(self.file_path, temp_path)
+
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+            raise
+
+        self.todos = todos
+        self._spans = spans
+        self._stat = self._current_stat()
+
+    def save(self, todos):
+        """Write the changes made to a :class:`todotxtio.TodoList` of the todos of this file since it was last committed,
+        then commit it.
+
+        When no todo was removed or moved, and modified todos still have the same length (but the last one), their lines
+        are overwritten in a single pass and added todos are appended as with :meth:`todotxtio.TodoFile.append`. The
+        file is rewritten once otherwise.
+
+        :param todotxtio.TodoList todos: The todos of this file
+        :rtype: dict
+        """
+        delta = todos.delta()
+
+        if delta['added'] or delta['removed'] or delta['modified'] or delta['reordered']:
+            self._check()
+
+            committed = len(todos) - len(delta['added'])
+            lines = None
+
+            if not (self._spans is None or delta['removed'] or delta['reordered'] or len(self.todos) != committed
+                    or any(position < committed for position, todo in delta['added'])):
+                lines = [(position, str(todo).encode(self.encoding)) for position, todo in delta['modified']]
+
+                # A line which isn't the last one can only be overwritten by one of the same length
+                for position, line in lines:
+                    start, end = self._spans[position]
+
+                    if len(line) != end - start and position != committed - 1:
+                        lines = None
+                        break
+
+            if lines is None:
+                self.rewrite(todos)
+            else:
+                self._overwrite(lines, committed - 1)
+
+                for position, todo in delta['modified']:
+                    self.todos[position] = todo
+
+                self.append(todo for position, todo in delta['added'])
+
+        return todos.commit()
+
+    def _overwrite(self, lines, last):
+        """Overwrite the given ``(position, encoded line)`` lines in a single pass, the one at the ``last`` position
+        being allowed to change its length."""
+        if not lines:
+            return
+
+        with open(self.file_path, 'r+b') as stream:
+            for position, line in lines:
+                start = self._spans[position][0]
+
+                stream.seek(start)
+                stream.write(line)
+
+                if position == last:
+                    stream.truncate()
+
+                self._spans[position] = (start, start + len(line))
+
+        self._stat = self._current_stat()
+
+    def _check(self):
+        """Load the file if it isn't, or make sure it wasn't modified by someone else since it was last loaded."""
+        if self.todos is None:
+            self.load()
+        elif self._current_stat() != self._stat:
+            raise ValueError('File has been modified since it was loaded: ' + self.file_path)
+
+    def _current_stat(self):
+        stat = os.stat(self.file_path)
+
+        return stat.st_size, stat.st_mtime_ns
+
+    def __repr__(self):
+        return '<TodoFile: ' + self.file_path + '>'
+
+
+class TodoList(list):
+    """A list of todos recording which ones were added, removed or modified since it was last committed.
+
+    Todos are compared to the state they had when the list was last committed, so in-place modifications (including
+    the ones of their projects, contexts and tags) are found without having to tell the list about them. It's
+    otherwise a regular list.
+
+    :param iterable todos: :class:`todotxtio.Todo` objects
+    """
+    def __init__(self, todos=()):
+        super().__init__(todos)
+
+        self._commit()
+
+    def dirty(self):
+        """Return whether todos were added, removed, modified or moved since the list was last committed.
+
+        :rtype: bool
+        """
+        if len(self) != len(self._todos) or not all(map(operator.is_, self, self._todos)):
+            return True
+
+        return any(map(operator.ne, map(_todo_state, self), self._states))
+
+    def delta(self):
+        """Return the changes made to the list since it was last committed.
+
+        The returned dict has ``added``, ``modified`` and ``removed`` lists of ``(position, todo)`` tuples, positions
+        being the current ones for added and modified todos, and the ones at the last commit for removed todos.
+        ``reordered`` is whether the todos which were already there aren't in the same order anymore.
+
+        :rtype: dict
+        """
+        if len(self) == len(self._todos) and all(map(operator.is_, self, self._todos)): # Only modifications are possible
+            return {
+                'added': [],
+                'removed': [],
+                'modified': list(compress(enumerate(self), map(operator.ne, map(_todo_state, self), self._states))),
+                'reordered': False
+            }
+
+        positions = list(map(self._positions.get, map(id, self))) # Position of each todo at the last commit
+        states = self._states
+        added = []
+        modified = []
+
+        for position, todo, committed in zip(range(len(self)), self, positions):
+            if committed is None:
+                added.append((position, todo))
+            elif _todo_state(todo) != states[committed]:
+                modified.append((position, todo))
+
+        kept = [committed for committed in positions if committed is not None]
+        present = set(kept)
+
+        return {
+            'added': added,
+            'removed': [(position, todo) for position, todo in enumerate(self._todos) if position not in present],
+            'modified': modified,
+            'reordered': any(map(operator.gt, kept, kept[1:]))
+        }
+
+    def commit(self):
+        """Make the current todos the reference to record changes from, and return the changes made until now (see
+        :meth:`todotxtio.TodoList.delta`).
+
+        :rtype: dict
+        """
+        delta = self.delta()
+
+        self._commit()
+
+        return delta
+
+    def _commit(self):
+        with _gc_paused(): # Lots of tuples are created, which would trigger lots of useless collections
+            self._todos = list(self) # Committed todos are kept, so their ids can't be reused by new ones
+            self._states = list(map(_todo_state, self))
+            self._positions = dict(zip(map(id, self), range(len(self))))
+
+    def __repr__(self):
+        return '<TodoList: ' + str(len(self)) + ' todos>'
+
+
+def _todo_state(todo):
+    """Return the values of a todo, with copies of its projects, contexts and tags, to find out later whether it was
+    modified.
+
+    :param todotxtio.Todo todo: The todo
+    :rtype: tuple
+    """
+    return (
+        todo.text,
+        todo._completed,
+        todo._completion_date,
+        todo.priority,
+        todo.creation_date,
+        tuple(todo._projects) if todo._projects else (),
+        tuple(todo._contexts) if todo._contexts else (),
+        tuple(todo._tags.items()) if todo._tags else ()
+    )
+
+
+class CachedLoader:
+    """Load todo files, memoizing the parsed todos of each file until it changes.
+
+    A file is considered changed when its size or modification time changes, or, if ``check_hash`` is ``True``, when
+    the hash of its content changes (which requires reading the file on each load). When the cache is full, the least
+    recently loaded files are evicted first.
+
+    Each load returns new :class:`todotxtio.Todo` objects, so modifying them doesn't affect the cache.
+
+    :param int maxsize: Maximum number of files to keep in cache
+    :param int max_bytes: Maximum total size of the files kept in cache, or ``None`` for no limit
+    :param bool check_hash: Whether to also check the hash of the files content
+    """
+    def __init__(self, maxsize=128, max_bytes=None, check_hash=False):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.check_hash = check_hash
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def load(self, file_path, encoding='utf-8'):
+        """Load a todo list from a file, or from the cache if the file didn't change since it was last loaded.
+
+        :param str file_path: Path to the file
+        :param str encoding: The encoding of the file to open
+        :rtype: list
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError('File doesn\'t exists: ' + file_path)
+
+        key = (os.path.abspath(file_path), encoding)
+        stat = os.stat(file_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        content = digest = None
+
+        if self.check_hash:
+            with open(file_path, 'rb') as stream:
+                content = stream.read()
+
+            digest = hashlib.sha1(content).digest()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = entry is not None and entry[0] == signature and entry[1] == digest
+
+            if hit:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if hit:
+            with _gc_paused():
+                return [_copy_todo(todo_fields) for todo_fields in entry[2]]
+
+        if content is None:
+            with open(file_path, 'rb') as stream:
+                content = stream.read()
+
+        with _gc_paused():
+            fields = [_parse_fields(line) for line in _iter_lines(_split_string(content.decode(encoding)))]
+
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+
+            if old_entry is not None:
+                self._bytes -= old_entry[3]
+
+            self._entries[key] = (signature, digest, fields, len(content))
+            self._bytes += len(content)
+
+            while self._entries and (len(self._entries) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                self._bytes -= self._entries.popitem(last=False)[1][3]
+                self.evictions += 1
+
+        with _gc_paused():
+            return [_copy_todo(todo_fields) for todo_fields in fields]
+
+    def invalidate(self, file_path, encoding='utf-8'):
+        """Remove a file from the cache.
+
+        :param str file_path: Path to the file
+        :param str encoding: The encoding the file was loaded with
+        """
+        with self._lock:
+            entry = self._entries.pop((os.path.abspath(file_path), encoding), None)
+
+            if entry is not None:
+                self._bytes -= entry[3]
+
+    def clear(self):
+        """Remove all the files from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self):
+        """Return the cache statistics.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def __repr__(self):
+        return '<CachedLoader: ' + str(len(self._entries)) + ' files>'
+
+
+def _copy_todo(fields):
+    """Create a todo from parsed fields (see :func:`todotxtio._parse_fields`), with its own containers."""
+    text, completed, completion_date, priority, creation_date, projects, contexts, tags = fields
+
+    return Todo(text, completed, completion_date, priority, creation_date, projects and list(projects), contexts and list(contexts), tags and dict(tags))
+
+
+class LineMemo:
+    """A bounded memo of parsed todo lines, to be used when parsing the same todo list again and again.
+
+    When a todo list is parsed again with the same memo, the lines that were already parsed aren't parsed again. This
+    is useful when reloading a big file of which only a few lines usually change. New :class:`todotxtio.Todo`
+    objects are returned each time.
+
+    The memo holds the lines of the current and of the previous generation: when the current one is full, it becomes
+    the previous one, and lines of the older generation are forgotten. A line found in the previous generation is
+    brought back to the current one.
+
+    Parsed lines are interned in a single symbol table (see :func:`todotxtio.from_string`): they are forgotten when
+    lines are parsed with another one.
+
+    :param int maxsize: Maximum number of lines per generation
+    """
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._current = {}
+        self._previous = {}
+        self._symbols = None
+        self._intern = sys.intern
+
+    def parse(self, line, symbols=None):
+        """Parse a single, already stripped, todo line, or reuse its already parsed data.
+
+        :param str line: The line to parse
+        :param dict symbols: Symbol table to intern projects, contexts, tag names and dates in
+        :rtype: todotxtio.Todo
+        """
+        if symbols is not self._symbols:
+            self.clear()
+
+            self._symbols = symbols
+            self._intern = sys.intern if symbols is None else _interner(symbols)
+
+        fields = self._current.get(line)
+
+        if fields is not None:
+            self.hits += 1
+        else:
+            fields = self._previous.get(line)
+
+            if fields is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                fields = _parse_fields(line, self._intern)
+
+            if len(self._current) >= self.maxsize:
+                self._previous = self._current
+                self._current = {}
+
+            self._current[line] = fields
+
+        return _copy_todo(fields)
+
+    def clear(self):
+        """Forget all the parsed lines."""
+        self._current = {}
+        self._previous = {}
+
+    def __len__(self):
+        return len(self._current) + len(self._previous)
+
+    def __repr__(self):
+        return '<LineMemo: ' + str(len(self)) + ' lines>'
+
+
+class Stats:
+    """Statistics about parsing, writing and searching todos, recorded while enabled by :func:`todotxtio.collect_stats`.
+
+    ``phases`` maps each phase to the time spent in it, in seconds: ``read`` (reading, decoding and splitting lines),
+    ``prefix`` (parsing the completion mark, priority and dates), ``extract`` (extracting projects, contexts and tags),
+    ``construct`` (creating :class:`todotxtio.Todo` objects, or reusing parsed lines of a memo), ``format`` (converting
+    todos to text), ``write`` and ``search``.
+
+    ``counters`` maps each counter to its value: numbers of lines and characters parsed, of bytes read from files, of
+    lines having each of the prefix data, of lines parsed by the tokenizer or by the regular expressions fallback, of
+    projects, contexts and tags found, of todos and characters written, and of searches, todos searched and todos
+    matched.
+
+    ``criteria`` maps each search criteria to the number of todos it has been checked against and of the ones it
+    matched. Criteria are checked in order, so a criteria is only checked against the todos matching the previous ones.
+
+    Statistics of todo files parsed in parallel by ``workers`` processes aren't recorded.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Reset all the statistics."""
+        self.phases = dict.fromkeys(('read', 'prefix', 'extract', 'construct', 'format', 'write', 'search'), 0.0)
+        self.counters = dict.fromkeys((
+            'lines', 'chars', 'bytes_read', 'completed', 'completion_date', 'priority', 'creation_date', 'tokenized',
+            'regex_parsed', 'projects', 'contexts', 'tags', 'todos_written', 'chars_written', 'searches',
+            'todos_searched', 'todos_matched'
+        ), 0)
+        self.criteria = {}
+
+    def to_dict(self):
+        """Export the statistics as a dict of plain values.
+
+        :rtype: dict
+        """
+        return {
+            'phases': dict(self.phases),
+            'counters': dict(self.counters),
+            'criteria': {
+                name: {'checked': checked, 'matched': matched, 'selectivity': matched / checked if checked else None}
+                for name, (checked, matched) in self.criteria.items()
+            }
+        }
+
+    def _count_lines(self, lines):
+        """Yield the given lines, recording their number, their length and the time spent reading them."""
+        counters = self.counters
+        phases = self.phases
+        perf_counter = time.perf_counter
+        lines = iter(lines)
+
+        while True:
+            start = perf_counter()
+            line = next(lines, None)
+            phases['read'] += perf_counter() - start
+
+            if line is None:
+                return
+
+            counters['lines'] += 1
+            counters['chars'] += len(line)
+
+            yield line
+
+    def _line_parser(self, memo, symbols):
+        """Return the function parsing a line to a todo with :func:`todotxtio._parse_line`, while timing each of its
+        phases and counting what's found."""
+        counters = self.counters
+        phases = self.phases
+        perf_counter = time.perf_counter
+        intern = sys.intern if symbols is None else _interner(symbols)
+
+        if memo is not None:
+            def parse_line(line):
+                start = perf_counter()
+                todo = memo.parse(line, symbols)
+                phases['construct'] += perf_counter() - start
+
+                return todo
+
+            return parse_line
+
+        last = 0.0
+
+        def mark(phase, counter=None):
+            nonlocal last
+
+            now = perf_counter()
+            phases[phase] += now - last
+            last = now
+
+            if counter is not None:
+                counters[counter] += 1
+
+        def parse_line(line):
+            nonlocal last
+
+            last = perf_counter()
+            todo = _parse_line(line, intern, mark)
+
+            counters['completed'] += 1 if todo._completed else 0
+            counters['completion_date'] += todo._completion_date is not None
+            counters['priority'] += todo.priority is not None
+            counters['creation_date'] += todo.creation_date is not None
+            counters['projects'] += len(todo._projects) if todo._projects else 0
+            counters['contexts'] += len(todo._contexts) if todo._contexts else 0
+            counters['tags'] += len(todo._tags) if todo._tags else 0
+
+            return todo
+
+        return parse_line
+
+    def _count_written(self, todos, chars, format_time, write_time):
+        self.counters['todos_written'] += todos
+        self.counters['chars_written'] += chars
+        self.phases['format'] += format_time
+        self.phases['write'] += write_time
+
+    def _matcher(self, checks):
+        """Return a function checking whether a todo matches the given named checks, counting how many todos each of
+        them is checked against and matches.
+
+        Time spent in lazy searches isn't recorded, as it's interleaved with the consumer's own work."""
+        counters = self.counters
+        counters['searches'] += 1
+        checks = [(self.criteria.setdefault(name, [0, 0]), check) for name, check in checks]
+
+        def match(todo):
+            counters['todos_searched'] += 1
+
+            for counts, check in checks:
+                counts[0] += 1
+
+                if not check(todo):
+                    return False
+
+                counts[1] += 1
+
+            counters['todos_matched'] += 1
+
+            return True
+
+        return match
+
+    def _count_search(self, todos, matched, search_time):
+        self.counters['searches'] += 1
+        self.counters['todos_searched'] += todos
+        self.counters['todos_matched'] += matched
+        self.phases['search'] += search_time
+
+    def __repr__(self):
+        return '<Stats: ' + str(self.counters['lines']) + ' lines, ' + str(self.counters['searches']) + ' searches>'
+
+
+_stats = None
+
+
+@contextmanager
+def collect_stats(stats=None):
+    """Record statistics about parsing, writing and searching todos for the duration of the context.
+
+    Statistics are recorded process-wide, in the given :class:`todotxtio.Stats` object or in a new one, which is
+    returned by the context manager. When no statistics are collected, only a single check is done per function call.
+
+    :param todotxtio.Stats stats: The object to record statistics in
+    :rtype: todotxtio.Stats
+    """
+    global _stats
+
+    previous = _stats
+    _stats = stats if stats is not None else Stats()
+
+    try:
+        yield _stats
+    finally:
+        _stats = previous